@@ -1,14 +1,19 @@
 """The FordPass integration."""
 import asyncio
 import logging
+import time
+from contextlib import nullcontext
 from datetime import timedelta
+from functools import partial
 
 import async_timeout
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
@@ -16,21 +21,47 @@ from homeassistant.helpers.update_coordinator import (
 )
 
 from .const import (
+    ACCOUNTS,
+    ADAPTIVE_POLLING,
+    ADAPTIVE_POLLING_DEFAULT,
     CONF_DISTANCE_UNIT,
+    COMMAND_SKIP_WINDOW,
+    COMMAND_SKIP_WINDOW_DEFAULT,
     CONF_PRESSURE_UNIT,
     DEFAULT_DISTANCE_UNIT,
     DEFAULT_PRESSURE_UNIT,
+    DAILY_REQUEST_BUDGET,
+    DAILY_REQUEST_BUDGET_DEFAULT,
     DEFAULT_REGION,
     DOMAIN,
+    ENDPOINTS,
     MANUFACTURER,
+    POLL_INTERVAL_MAX,
+    POLL_INTERVAL_MAX_DEFAULT,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_MIN_DEFAULT,
+    POLL_STATE_INTERVALS,
     REGION,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_VERSION,
+    STATUS_CORE_KEYS,
+    STATUS_FULL_INTERVAL,
     VEHICLE,
     VIN,
     UPDATE_INTERVAL,
     UPDATE_INTERVAL_DEFAULT,
     COORDINATOR
 )
-from .fordpass_new import Vehicle
+from .account import FordPassAccount
+from .executor import get_executor
+from .ratelimit import PRIORITY_SERVICE, PRIORITY_SETUP, RateLimited, request_priority
+from .changes import SECTIONS, changed_keys, touches
+from .scheduler import AdaptivePoller, EndpointSchedule
+from .telemetry import Telemetry, telemetry_keys
+from .tokens import LoginThrottled
+from .transport import CircuitOpen
+from .trips import TripCache
 
 CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 
@@ -63,16 +94,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     else:
         _LOGGER.debug("CANT GET REGION")
         region = DEFAULT_REGION
-    coordinator = FordPassDataUpdateCoordinator(hass, user, password, vin, region, update_interval, 1)
+    daily_budget = entry.options.get(DAILY_REQUEST_BUDGET, DAILY_REQUEST_BUDGET_DEFAULT)
+    account = async_get_account(hass, user, password, region)
+    poller = None
+    if entry.options.get(ADAPTIVE_POLLING, ADAPTIVE_POLLING_DEFAULT):
+        poller = AdaptivePoller(
+            update_interval,
+            entry.options.get(POLL_INTERVAL_MIN, POLL_INTERVAL_MIN_DEFAULT),
+            entry.options.get(POLL_INTERVAL_MAX, POLL_INTERVAL_MAX_DEFAULT),
+            account.client.limiter,
+            vin,
+            POLL_STATE_INTERVALS,
+        )
+    coordinator = FordPassDataUpdateCoordinator(hass, account, vin, update_interval, poller, daily_budget)
+    coordinator.vehicle.skip_window = entry.options.get(COMMAND_SKIP_WINDOW, COMMAND_SKIP_WINDOW_DEFAULT)
 
-    await coordinator.async_refresh()  # Get initial data
+    if await coordinator.async_restore():
+        # Entities are set up from the saved payload, the live data follows in the background
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN} refresh {vin}")
+    else:
+        await coordinator.async_refresh()  # Get initial data
 
     fordpass_options_listener = entry.add_update_listener(options_update_listener)
 
+    async def async_stop(event):
+        """Write pending tokens before Home Assistant exits."""
+        await account.close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop)
+    )
+
     if not entry.options:
         await async_update_options(hass, entry)
 
-    if not coordinator.last_update_success:
+    if coordinator.data is None:
+        await async_release_account(hass, account, vin)
         raise ConfigEntryNotReady
 
     hass.data[DOMAIN][entry.entry_id] = {
@@ -85,15 +142,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     async def async_refresh_status_service(service_call):
-        await hass.async_add_executor_job(
-            refresh_status, hass, service_call, coordinator
-        )
+        with request_priority(PRIORITY_SERVICE):
+            await refresh_status(hass, service_call, coordinator)
 
     async def async_clear_tokens_service(service_call):
-        await hass.async_add_executor_job(clear_tokens, hass, service_call, coordinator)
+        await clear_tokens(hass, service_call, coordinator)
 
     async def poll_api_service(service_call):
-        await coordinator.async_request_refresh()
+        with request_priority(PRIORITY_SERVICE):
+            await coordinator.async_request_refresh()
 
     async def handle_reload(service):
         """Handle reload service call."""
@@ -116,9 +173,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             _LOGGER.debug("Starting charge logs service call")
             _LOGGER.debug("VIN: %s", vin)
             
-            logs = await hass.async_add_executor_job(
-                coordinator.vehicle.ev_energy_transfer_logs
-            )
+            with request_priority(PRIORITY_SERVICE):
+                logs = await coordinator.vehicle.ev_energy_transfer_logs()
             
             _LOGGER.debug("Received logs: %s", logs)
             
@@ -200,42 +256,103 @@ async def options_update_listener(hass: HomeAssistant, entry: ConfigEntry):
     await hass.config_entries.async_reload(entry.entry_id)
 
 
-def refresh_status(hass, service, coordinator):
+async def refresh_status(hass, service, coordinator):
     """Get latest vehicle status from vehicle, actively polls the car"""
     _LOGGER.debug("Running Service")
     vin = service.data.get("vin", "")
-    status = coordinator.vehicle.request_update(vin)
+    status = await coordinator.vehicle.request_update(vin)
     if status == 401:
         _LOGGER.debug("Invalid VIN")
     elif status == 200:
         _LOGGER.debug("Refresh Sent")
 
 
-def clear_tokens(hass, service, coordinator):
+async def clear_tokens(hass, service, coordinator):
     """Clear the token file in config directory, only use in emergency"""
     _LOGGER.debug("Clearing Tokens")
-    coordinator.vehicle.clear_token()
+    await coordinator.vehicle.clear_token()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
     if await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = entry_data[COORDINATOR]
+        await async_release_account(hass, coordinator.account, coordinator.vin)
         return True
     return False
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved snapshot of a deleted config entry."""
+    await snapshot_store(hass, entry.data[VIN]).async_remove()
+
+
+def snapshot_store(hass, vin):
+    """Return the store holding the last good payload of a vehicle."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}_snapshot_{vin}", private=True, atomic_writes=True)
+
+
+def async_get_account(hass, user, password, region):
+    """Return the shared client for a FordPass login, creating it on first use."""
+    accounts = hass.data[DOMAIN].setdefault(ACCOUNTS, {})
+    key = (user, region)
+    if key not in accounts:
+        config_path = hass.config.path("custom_components/fordpass/" + user + "_fordpass_token.txt")
+        accounts[key] = FordPassAccount(user, password, region, True, config_path)
+    return accounts[key]
+
+
+async def async_release_account(hass, account, vin):
+    """Drop a VIN from its account, closing the account once no VINs use it."""
+    if await account.release(vin):
+        accounts = hass.data[DOMAIN].get(ACCOUNTS, {})
+        accounts.pop((account.username, account.region), None)
+        await account.close()
+        if not accounts:
+            get_executor().shutdown()
+
+
 class FordPassDataUpdateCoordinator(DataUpdateCoordinator):
     """DataUpdateCoordinator to handle fetching new data about the vehicle."""
 
-    def __init__(self, hass, user, password, vin, region, update_interval, save_token=False):
+    def __init__(self, hass, account, vin, update_interval, poller=None, daily_budget=None):
         """Initialize the coordinator and set up the Vehicle object."""
         self._hass = hass
         self.vin = vin
-        config_path = hass.config.path("custom_components/fordpass/" + user + "_fordpass_token.txt")
-        self.vehicle = Vehicle(user, password, vin, region, save_token, config_path)
+        self.account = account
+        self.poller = poller
+        # Keys that changed on the last refresh, None when every entity should update
+        self.changed = None
+        # True while data comes from the saved snapshot rather than the API
+        self.stale = False
+        self._store = snapshot_store(hass, vin)
+        # Bumped whenever data is replaced so entities can cache what they compute from it
+        self.generation = 0
+        # Typed view of data, decoded once per refresh for the entities to read
+        self.telemetry = None
+        self.trips = TripCache()
+        self.vehicle = account.vehicle(vin, daily_budget)
         self._available = True
+        self._schedules = {
+            name: EndpointSchedule(name, endpoint["interval"], endpoint["ttl"])
+            for name, endpoint in ENDPOINTS.items()
+        }
+        # Dependencies of the entities added to Home Assistant, disabled entities never subscribe
+        self._subscriptions = {}
+        self._full_keys = None
+        self._full_at = None
+        self._fetchers = {
+            "status": self._async_fetch_status,
+            # Account-wide payloads are fetched once and shared by every VIN on the login,
+            # a payload up to half an interval old is reused so it never goes more than 1.5 intervals stale
+            "messages": partial(account.messages, ENDPOINTS["messages"]["interval"] / 2),
+            "vehicles": partial(account.vehicles, ENDPOINTS["vehicles"]["interval"] / 2),
+            "guardstatus": self.vehicle.guard_status,
+            "energytransferstatus": self.vehicle.energy_transfer_status,
+            "rccstatus": self.vehicle.rcc_status,
+        }
 
         super().__init__(
             hass,
@@ -244,44 +361,251 @@ class FordPassDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=update_interval),
         )
 
-    async def _async_update_data(self):
-        """Fetch data from FordPass."""
+    async def async_restore(self):
+        """Load the last saved payload, returning True if there was one."""
         try:
-            async with async_timeout.timeout(30):
-                data = await self._hass.async_add_executor_job(
-                    self.vehicle.status  # Fetch new status
-                )
-
-                # Temporarily removed due to Ford backend API changes
-                # data["guardstatus"] = await self._hass.async_add_executor_job(
-                #    self.vehicle.guardStatus  # Fetch new status
-                # )
-
-                data["messages"] = await self._hass.async_add_executor_job(
-                    self.vehicle.messages
-                )
-                data["vehicles"] = await self._hass.async_add_executor_job(
-                    self.vehicle.vehicles
-                )
-                _LOGGER.debug(data)
-                # If data has now been fetched but was previously unavailable, log and reset
-                if not self._available:
-                    _LOGGER.info("Restored connection to FordPass for %s", self.vin)
-                    self._available = True
-
-                return data
+            snapshot = await self._store.async_load()
         except Exception as ex:
+            _LOGGER.warning("Ignoring unreadable snapshot for %s: %s", self.vin, ex)
+            return False
+        if not snapshot or not snapshot.get("data"):
+            return False
+        saved_at = dt_util.parse_datetime(snapshot.get("saved_at") or "")
+        if saved_at is None or (dt_util.utcnow() - saved_at).total_seconds() > SNAPSHOT_MAX_AGE:
+            _LOGGER.debug("Ignoring snapshot for %s saved %s, it is too old", self.vin, snapshot.get("saved_at"))
+            return False
+        _LOGGER.debug("Starting %s from snapshot saved %s", self.vin, snapshot.get("saved_at"))
+        data = snapshot["data"]
+        now = time.monotonic()
+        for endpoint, schedule in self._schedules.items():
+            if endpoint != "status" and data.get(endpoint) is not None:
+                schedule.restore(data[endpoint], now)
+        # The saved status may be projected, the full key set tells which entities the vehicle supports
+        if snapshot.get("full_keys") is not None:
+            self._full_keys = set(snapshot["full_keys"])
+        self._track(data)
+        self.data = data
+        self.stale = True
+        return True
+
+    @callback
+    def _snapshot(self):
+        return {
+            "saved_at": dt_util.utcnow().isoformat(),
+            "data": self.data,
+            "full_keys": sorted(self._full_keys) if self._full_keys is not None else None,
+        }
+
+    def reports(self, key):
+        """Return True if the vehicle reports a "<section>.<name>" key, in the current data or the last full payload."""
+        section, _, name = key.partition(".")
+        return name in ((self.data or {}).get(section) or {}) or key in (self._full_keys or ())
+
+    @callback
+    def subscribe(self, dependencies):
+        """Register the data keys an entity reads, returning a callback that removes them."""
+        token = object()
+        self._subscriptions[token] = dependencies
+
+        @callback
+        def unsubscribe():
+            self._subscriptions.pop(token, None)
+        return unsubscribe
+
+    def _projection(self, now):
+        """Return the telemetry keys the subscribed entities read, or None when the full payload is needed."""
+        if self._full_at is None or now - self._full_at >= STATUS_FULL_INTERVAL:
+            return None
+        keys = set(STATUS_CORE_KEYS)
+        for dependencies in self._subscriptions.values():
+            # An empty list reads no telemetry and adds nothing, only missing dependencies need the full payload
+            if dependencies is None:
+                return None
+            for dependency in dependencies:
+                if dependency.endswith("*"):
+                    # Prefixes are expanded against the keys seen in the last full payload
+                    prefix = dependency[:-1]
+                    keys.update(key for key in self._full_keys if key.startswith(prefix))
+                elif dependency.partition(".")[0] in SECTIONS:
+                    keys.add(dependency)
+        return keys
+
+    async def _async_fetch_status(self):
+        """Fetch telemetry, asking only for what enabled entities read between full payloads."""
+        now = time.monotonic()
+        keys = self._projection(now)
+        data = await self.vehicle.status(keys)
+        if keys is None and data:
+            self._full_keys = telemetry_keys(data)
+            self._full_at = now
+        return data
+
+    def capability(self, name):
+        """Return a capability flag for this VIN from the expdashboard payload."""
+        vehicles = (self.data or {}).get("vehicles") or {}
+        capabilities = vehicles.get("vehicleCapabilities") or []
+        for entry in capabilities:
+            if entry.get("VIN") == self.vin:
+                return entry.get(name)
+        if len(capabilities) == 1:
+            return capabilities[0].get(name)
+        return None
+
+    def profile(self, name):
+        """Return a vehicle profile field for this VIN from the expdashboard payload."""
+        vehicles = (self.data or {}).get("vehicles") or {}
+        profiles = vehicles.get("vehicleProfile") or []
+        for entry in profiles:
+            if entry.get("VIN") == self.vin:
+                return entry.get(name)
+        if len(profiles) == 1:
+            return profiles[0].get(name)
+        return None
+
+    def _endpoint_supported(self, endpoint):
+        """Skip endpoints the vehicle is known not to support."""
+        if endpoint == "guardstatus":
+            return self.capability("guardMode") == "Display"
+        if endpoint == "rccstatus":
+            return self.capability("remoteClimateControl") == "Display"
+        if endpoint == "energytransferstatus":
+            return "xevPlugChargerStatus" in (self.data or {}).get("metrics", {})
+        return True
+
+    async def _async_fetch(self, endpoint):
+        """Fetch a single endpoint within its own timeout."""
+        async with async_timeout.timeout(ENDPOINTS[endpoint]["timeout"]):
+            result = await self._fetchers[endpoint]()
+        if result is None or result is False:
+            raise UpdateFailed(f"No {endpoint} data returned")
+        return result
+
+    async def async_refresh_endpoints(self, endpoints=("status",)):
+        """Fetch the given endpoints only and merge them into the current data, the others keep their schedule."""
+        results = await asyncio.gather(*(self._async_fetch(endpoint) for endpoint in endpoints), return_exceptions=True)
+        now = time.monotonic()
+        data = None
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Refreshing %s for %s failed: %s", endpoint, self.vin, result)
+                continue
+            self._schedules[endpoint].update(result, now)
+            if endpoint == "status":
+                data = result
+            elif data is None and self.data is not None:
+                # Without fresh telemetry the current payload is kept and only the endpoint is replaced
+                data = dict(self.data)
+        if data is None:
+            return
+        for endpoint, schedule in self._schedules.items():
+            if endpoint != "status":
+                data[endpoint] = schedule.current(now)
+        self.async_set_updated_data(data)
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_set_updated_data(self, data) -> None:
+        """Replace data without fetching, keeping change tracking in step."""
+        self._track(data)
+        super().async_set_updated_data(data)
+
+    def _track(self, data):
+        """Record what changed against the current data and decode the new payload."""
+        self.changed = changed_keys(self.data, data)
+        self.generation += 1
+        self.telemetry = Telemetry(data)
+
+    def _adapt_interval(self, data, now):
+        """Pick the next telemetry interval from the state the vehicle reported."""
+        previous = self.poller.state
+        interval = self.poller.next_interval(data, now)
+        if self.poller.state != previous:
+            _LOGGER.debug("%s is %s, polling every %s seconds", self.vin, self.poller.state, interval)
+        self.update_interval = timedelta(seconds=interval)
+
+    def _record(self, endpoints, results, now):
+        """Store the payloads fetched for endpoints in their schedules, skipping the ones that failed."""
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, (RateLimited, CircuitOpen, LoginThrottled)):
+                _LOGGER.debug("Skipping %s for %s: %s", endpoint, self.vin, result)
+                continue
+            if isinstance(result, BaseException):
+                _LOGGER.warning("Error fetching %s for %s, keeping last known data: %s", endpoint, self.vin, result)
+                continue
+            self._schedules[endpoint].update(result, now)
+
+    async def _async_update_data(self):
+        """Fetch data from FordPass."""
+        now = time.monotonic()
+        # Telemetry is fetched every tick, everything else only once its interval has passed
+        due = [
+            endpoint for endpoint, schedule in self._schedules.items()
+            if endpoint != "status" and schedule.is_due(now) and self._endpoint_supported(endpoint)
+        ]
+        _LOGGER.debug("Refreshing %s for %s", ["status", *due], self.vin)
+        # Without data the entry can't be set up, so the first refresh waits for its tokens instead of being shed
+        with request_priority(PRIORITY_SETUP) if self.data is None else nullcontext():
+            data, *results = await asyncio.gather(
+                self._async_fetch("status"),
+                *(self._async_fetch(endpoint) for endpoint in due),
+                return_exceptions=True,
+            )
+        # Keep what the other endpoints returned even if telemetry failed, so they aren't fetched again next tick
+        self._record(due, results, now)
+        if isinstance(data, RateLimited) and self.data is not None:
+            # Shed to stay within the request budget, keep the current data until the next tick
+            _LOGGER.debug("Skipping refresh for %s: %s", self.vin, data)
+            self.changed = set()
+            # Only entities that read no telemetry, like the request budget, write state
+            self.generation += 1
+            return self.data
+        if isinstance(data, (CircuitOpen, LoginThrottled)):
+            # Already logged when the host was paused or the login limit was hit
+            self._available = False
+            raise UpdateFailed(f"FordPass requests for {self.vin} are paused: {data}") from data
+        if isinstance(data, BaseException):
             self._available = False  # Mark as unavailable
-            _LOGGER.warning(str(ex))
+            _LOGGER.warning(str(data))
             _LOGGER.warning("Error communicating with FordPass for %s", self.vin)
             raise UpdateFailed(
                 f"Error communicating with FordPass for {self.vin}"
-            ) from ex
+            ) from data
+        self._schedules["status"].update(data, now)
+
+        # Merge the sub-payloads that are still within their TTL
+        for endpoint, schedule in self._schedules.items():
+            if endpoint != "status":
+                data[endpoint] = schedule.current(now)
+        _LOGGER.debug(data)
+        self._track(data)
+        if self.stale:
+            # Every entity drops its assumed state on the first live payload
+            self.changed = None
+        _LOGGER.debug("Changed for %s: %s", self.vin, "all" if self.changed is None else sorted(self.changed))
+        if self.poller is not None:
+            self._adapt_interval(data, now)
+        self.stale = False
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+        # If data has now been fetched but was previously unavailable, log and reset
+        if not self._available:
+            _LOGGER.info("Restored connection to FordPass for %s", self.vin)
+            self._available = True
+
+        return data
 
 
 class FordPassEntity(CoordinatorEntity):
     """Defines a base FordPass entity."""
 
+    # Coordinator data keys the entity reads, None writes state on every refresh
+    dependencies = None
+    _last_available = True
+    _cache_generation = None
+    _cache = None
+    # Target state shown while a command runs, None when the entity shows what telemetry reports
+    _optimistic = None
+    _command_task = None
+
     def __init__(
         self, *, device_id: str, name: str, coordinator: FordPassDataUpdateCoordinator
     ):
@@ -290,6 +614,80 @@ class FordPassEntity(CoordinatorEntity):
         self._device_id = device_id
         self._name = name
 
+    def cached(self, compute):
+        """Return compute(), running it at most once per coordinator data generation."""
+        if self._cache_generation != self.coordinator.generation:
+            self._cache = compute()
+            self._cache_generation = self.coordinator.generation
+        return self._cache
+
+    @property
+    def available(self):
+        """Stay available on saved data until the first live refresh succeeds."""
+        return self.coordinator.last_update_success or self.coordinator.stale
+
+    @property
+    def assumed_state(self):
+        """Flag state restored from the snapshot or set by a pending command as not yet confirmed by the vehicle."""
+        return self.coordinator.stale or self._optimistic is not None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the data keys the entity reads."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.subscribe(self.dependencies))
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop waiting on a pending command."""
+        if self._command_task is not None:
+            self._command_task.cancel()
+        await super().async_will_remove_from_hass()
+
+    def _backing_endpoints(self):
+        """Return the coordinator endpoints the entity reads, telemetry when its dependencies don't say."""
+        dependencies = self.dependencies or ()
+        endpoints = [dependency for dependency in dependencies if dependency in ENDPOINTS]
+        if not endpoints or any(dependency.partition(".")[0] in SECTIONS for dependency in dependencies):
+            endpoints.append("status")
+        return tuple(endpoints)
+
+    @callback
+    def async_run_command(self, target, command):
+        """Show target as pending straight away and reconcile it once the command awaitable finishes."""
+        if self._command_task is not None:
+            self._command_task.cancel()
+        self._optimistic = target
+        self.async_write_ha_state()
+        self._command_task = self.hass.async_create_background_task(
+            self._async_reconcile(command), f"{DOMAIN} command {self.entity_id}"
+        )
+
+    async def _async_reconcile(self, command):
+        """Drop the pending state after the command, refreshing telemetry if it went through."""
+        try:
+            succeeded = await command
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            _LOGGER.warning("Command for %s failed: %s", self.entity_id, ex)
+            succeeded = False
+        if succeeded:
+            # The command check usually fetched telemetry moments ago, so this rarely costs a request
+            await self.coordinator.async_refresh_endpoints(self._backing_endpoints())
+        else:
+            _LOGGER.debug("Rolling back %s, the command did not go through", self.entity_id)
+        self._optimistic = None
+        self._command_task = None
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write state when availability or data the entity reads has changed."""
+        available = self.available
+        if available == self._last_available and not (available and touches(self.dependencies, self.coordinator.changed)):
+            return
+        self._last_available = available
+        super()._handle_coordinator_update()
+
     @property
     def name(self):
         """Return the name of the entity."""
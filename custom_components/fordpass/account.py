@@ -0,0 +1,50 @@
+"""Account level FordPass client shared by every vehicle on the same login"""
+import logging
+
+from .executor import get_executor
+from .fordpass_new import AsyncVehicle
+from .singleflight import SingleFlight
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FordPassAccount:
+    """Shares one session, token lifecycle and account-wide API calls between the VINs of a FordPass login"""
+
+    def __init__(self, username, password, region, save_token=False, config_location="", session=None):
+        self.username = username
+        self.region = region
+        # VIN-less client used for the account-wide endpoints, per VIN clients are derived from it
+        self.client = AsyncVehicle(username, password, "", region, save_token, config_location, session)
+        self.vins = set()
+        self._clients = {}
+        self._flights = SingleFlight()
+
+    def vehicle(self, vin, daily_budget=None):
+        """Return a client for one VIN on this account, its daily budget adds to the account's"""
+        self.vins.add(vin)
+        self.client.limiter.add_vehicle(vin, daily_budget)
+        self._clients[vin] = self.client.for_vin(vin)
+        return self._clients[vin]
+
+    async def release(self, vin):
+        """Stop tracking a VIN and close its client, returning True once no vehicles are left"""
+        self.vins.discard(vin)
+        client = self._clients.pop(vin, None)
+        if client is not None:
+            await client.close()
+        self.client.limiter.remove_vehicle(vin)
+        get_executor().release(vin)
+        return not self.vins
+
+    async def vehicles(self, max_age=0):
+        """Return the expdashboard payload, shared by all VINs while younger than max_age"""
+        return await self._flights.run("vehicles", self.client.vehicles, max_age)
+
+    async def messages(self, max_age=0):
+        """Return the message center payload, shared by all VINs while younger than max_age"""
+        return await self._flights.run("messages", self.client.messages, max_age)
+
+    async def close(self):
+        """Write pending tokens and close the shared session"""
+        await self.client.close()
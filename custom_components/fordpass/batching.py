@@ -0,0 +1,63 @@
+"""Coalescing of FordPass commands that are queued close together"""
+import asyncio
+import contextvars
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds a group collects intents before they are sent as one command
+COALESCE_WINDOW = 1.5
+
+
+class CommandQueue:
+    """Merges the intents of one vehicle queued within a short window into one command per group"""
+
+    def __init__(self, window=COALESCE_WINDOW):
+        self.window = window
+        self._pending = {}
+
+    async def submit(self, group, intents, send, replace=False):
+        """
+        Queue intents for group and wait for the command they end up in.
+        Intents are merged over the ones already pending, later values win and replace drops the earlier ones.
+        send(intents) is called once the window closes, every caller of the group gets its result.
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(group)
+        if pending is None:
+            pending = {"intents": {}, "future": loop.create_future()}
+            # The send runs with the context of the first caller so it keeps its request priority
+            pending["handle"] = loop.call_later(
+                self.window, self._flush, group, send, context=contextvars.copy_context()
+            )
+            self._pending[group] = pending
+        elif replace:
+            _LOGGER.debug("Dropping %s intents %s replaced by %s", group, pending["intents"], intents)
+        if replace:
+            pending["intents"].clear()
+        pending["intents"].update(intents)
+        return await asyncio.shield(pending["future"])
+
+    def _flush(self, group, send):
+        pending = self._pending.pop(group)
+        _LOGGER.debug("Sending %s intents %s", group, pending["intents"])
+        task = asyncio.get_running_loop().create_task(send(dict(pending["intents"])))
+        task.add_done_callback(lambda done: self._resolve(pending["future"], done))
+
+    @staticmethod
+    def _resolve(future, task):
+        if future.done():
+            return
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def cancel_all(self):
+        """Drop every group that hasn't been sent yet"""
+        for pending in self._pending.values():
+            pending["handle"].cancel()
+            pending["future"].cancel()
+        self._pending.clear()
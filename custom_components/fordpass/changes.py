@@ -0,0 +1,47 @@
+"""Change detection between consecutive FordPass coordinator payloads"""
+
+# Sections of the telemetry payload that are diffed per entry, changes are reported as "<section>.<name>"
+SECTIONS = ("metrics", "states", "events")
+
+
+def fingerprint(entry):
+    """Return a cheap comparable form of a payload entry, its updateTime when it carries one"""
+    if isinstance(entry, dict) and "updateTime" in entry:
+        return entry["updateTime"]
+    if isinstance(entry, list):
+        return tuple(fingerprint(item) for item in entry)
+    return entry
+
+
+def changed_keys(old, new):
+    """Return the keys that differ between two payloads, or None when there is nothing to compare against"""
+    if old is None or new is None:
+        return None
+    changed = set()
+    for key in old.keys() | new.keys():
+        if key in SECTIONS:
+            old_section = old.get(key) or {}
+            new_section = new.get(key) or {}
+            for name in old_section.keys() | new_section.keys():
+                if fingerprint(old_section.get(name)) != fingerprint(new_section.get(name)):
+                    changed.add(f"{key}.{name}")
+        elif old.get(key) != new.get(key):
+            changed.add(key)
+    return changed
+
+
+def touches(dependencies, changed):
+    """
+    Return True if any changed key is one of the dependencies, entries ending in * match by prefix.
+    Entities without dependencies (None) or that read no coordinator data (empty) are always touched
+    """
+    if not dependencies or changed is None:
+        return True
+    for dependency in dependencies:
+        if dependency.endswith("*"):
+            prefix = dependency[:-1]
+            if any(key.startswith(prefix) for key in changed):
+                return True
+        elif dependency in changed:
+            return True
+    return False
@@ -0,0 +1,137 @@
+"""Asynchronous tracking of FordPass vehicle commands"""
+import asyncio
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between completion checks and how long a command may take overall
+COMMAND_POLL_INTERVAL = 10
+COMMAND_DEADLINE = 130
+
+PENDING = "pending"
+SENT = "sent"
+SUCCESS = "success"
+FAILED = "failed"
+EXPIRED = "expired"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+PRECLUDED = "precluded"
+
+FINAL_STATES = (SUCCESS, FAILED, EXPIRED, TIMED_OUT, CANCELLED, PRECLUDED)
+
+
+class Command:
+    """A single vehicle command and where it is in its lifecycle, await it for the final state"""
+
+    def __init__(self, name, deadline):
+        self.name = name
+        self.command_id = None
+        self.state = PENDING
+        self.reason = None
+        self.created = time.monotonic()
+        self.deadline = self.created + deadline
+        self._future = asyncio.get_running_loop().create_future()
+        self._task = None
+
+    @property
+    def done(self):
+        """Return True once the command has reached a final state"""
+        return self.state in FINAL_STATES
+
+    @property
+    def succeeded(self):
+        """Return True if the vehicle confirmed the command"""
+        return self.state == SUCCESS
+
+    def add_done_callback(self, callback):
+        """Call callback(command) once the command reaches a final state"""
+        self._future.add_done_callback(lambda _: callback(self))
+
+    def cancel(self):
+        """Stop tracking the command, the vehicle may still act on it if it was already sent"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        elif not self.done:
+            self._finish(CANCELLED, "Cancelled before it was sent")
+
+    def _finish(self, state, reason=None):
+        if self.done:
+            return
+        self.state = state
+        self.reason = reason
+        _LOGGER.debug("Command %s (%s) finished: %s %s", self.name, self.command_id, state, reason or "")
+        if not self._future.done():
+            self._future.set_result(state)
+
+    def __await__(self):
+        return asyncio.shield(self._future).__await__()
+
+
+class CommandEngine:
+    """Sends commands and tracks their completion on a timer without blocking the caller"""
+
+    def __init__(self, poll_interval=COMMAND_POLL_INTERVAL, deadline=COMMAND_DEADLINE):
+        self.poll_interval = poll_interval
+        self.deadline = deadline
+        self.active = {}
+
+    def submit(self, name, send, check, deadline=None, callback=None, ready=None):
+        """
+        Start a command and return it straight away.
+        send() returns the command id, or None if the command was rejected.
+        check(command_id) returns a final state, or None while the command is still pending.
+        ready(refresh) returns why the vehicle can't take commands, or None when it can,
+        refresh is True when it should look at live data rather than what it already has.
+        A command the vehicle can't take, going by live data, fails straight away as precluded.
+        """
+        command = Command(name, self.deadline if deadline is None else deadline)
+        if callback is not None:
+            command.add_done_callback(callback)
+        command._task = asyncio.get_running_loop().create_task(self._run(command, send, check, ready))
+        self.active[id(command)] = command
+        command.add_done_callback(lambda cmd: self.active.pop(id(cmd), None))
+        return command
+
+    @staticmethod
+    async def _not_ready(command, ready):
+        """Return why the vehicle can't take the command, or None when it can"""
+        reason = await ready(False)
+        if reason is not None:
+            # What the client has may be old, only refuse when live data agrees
+            _LOGGER.debug("Command %s checking live data before refusing: %s", command.name, reason)
+            reason = await ready(True)
+        return reason
+
+    async def _run(self, command, send, check, ready=None):
+        try:
+            if ready is not None:
+                reason = await self._not_ready(command, ready)
+                if reason is not None:
+                    command._finish(PRECLUDED, reason)
+                    return
+            command.command_id = await send()
+            if command.command_id is None:
+                command._finish(FAILED, "Command was rejected")
+                return
+            command.state = SENT
+            while True:
+                state = await check(command.command_id)
+                if state is not None:
+                    command._finish(state)
+                    return
+                remaining = command.deadline - time.monotonic()
+                if remaining <= 0:
+                    command._finish(TIMED_OUT, "No confirmation before the deadline")
+                    return
+                await asyncio.sleep(min(self.poll_interval, remaining))
+        except asyncio.CancelledError:
+            command._finish(CANCELLED, "Cancelled")
+        except Exception as ex:
+            _LOGGER.debug("Command %s failed", command.name, exc_info=True)
+            command._finish(FAILED, str(ex))
+
+    def cancel_all(self):
+        """Cancel every command still being tracked"""
+        for command in list(self.active.values()):
+            command.cancel()
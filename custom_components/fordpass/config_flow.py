@@ -12,12 +12,22 @@ from base64 import urlsafe_b64encode
 
 
 from .const import (  # pylint:disable=unused-import
+    ADAPTIVE_POLLING,
+    ADAPTIVE_POLLING_DEFAULT,
     CONF_DISTANCE_UNIT,
     CONF_PRESSURE_UNIT,
     DEFAULT_DISTANCE_UNIT,
     DEFAULT_PRESSURE_UNIT,
+    DAILY_REQUEST_BUDGET,
+    DAILY_REQUEST_BUDGET_DEFAULT,
+    COMMAND_SKIP_WINDOW,
+    COMMAND_SKIP_WINDOW_DEFAULT,
     DISTANCE_UNITS,
     DOMAIN,
+    POLL_INTERVAL_MAX,
+    POLL_INTERVAL_MAX_DEFAULT,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_MIN_DEFAULT,
     PRESSURE_UNITS,
     REGION,
     REGION_OPTIONS,
@@ -28,7 +38,7 @@ from .const import (  # pylint:disable=unused-import
     DISTANCE_CONVERSION_DISABLED,
     DISTANCE_CONVERSION_DISABLED_DEFAULT
 )
-from .fordpass_new import Vehicle
+from .fordpass_new import AsyncVehicle
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -60,18 +70,21 @@ async def validate_token(hass: core.HomeAssistant, data):
     _LOGGER.debug(data)
     configPath = hass.config.path("custom_components/fordpass/" + data["username"] + "_fordpass_token.txt")
     _LOGGER.debug(configPath)
-    vehicle = Vehicle(data["username"], "", "", data["region"], 1, configPath)
-    results = await hass.async_add_executor_job(
-        vehicle.generate_tokens,
-        data["tokenstr"],
-        data["code_verifier"]
-    )
+    vehicle = AsyncVehicle(data["username"], "", "", data["region"], 1, configPath)
+    try:
+        results = await vehicle.generate_tokens(
+            data["tokenstr"],
+            data["code_verifier"]
+        )
 
-    if results:
-        _LOGGER.debug("Getting Vehicles")
-        vehicles = await(hass.async_add_executor_job(vehicle.vehicles))
-        _LOGGER.debug(vehicles)
-        return vehicles
+        if results:
+            _LOGGER.debug("Getting Vehicles")
+            vehicles = await vehicle.vehicles()
+            _LOGGER.debug(vehicles)
+            return vehicles
+    finally:
+        await vehicle.close()
+    return None
 
 
 async def validate_input(hass: core.HomeAssistant, data):
@@ -81,21 +94,25 @@ async def validate_input(hass: core.HomeAssistant, data):
     """
     _LOGGER.debug(data[REGION])
     configPath = hass.config.path("custom_components/fordpass/" + data[CONF_USERNAME] + "_fordpass_token.txt")
-    vehicle = Vehicle(data[CONF_USERNAME], data[CONF_PASSWORD], "", data[REGION], 1, configPath)
+    vehicle = AsyncVehicle(data[CONF_USERNAME], data[CONF_PASSWORD], "", data[REGION], 1, configPath)
 
     try:
-        result = await hass.async_add_executor_job(vehicle.auth)
+        result = await vehicle.auth()
     except Exception as ex:
+        await vehicle.close()
         raise InvalidAuth from ex
+    vehicles = None
     try:
         if result:
-            vehicles = await(hass.async_add_executor_job(vehicle.vehicles))
+            vehicles = await vehicle.vehicles()
     except Exception:
         vehicles = None
+    finally:
+        await vehicle.close()
     # except Exception as ex:
     #     raise InvalidAuth from ex
 
-    # result3 = await hass.async_add_executor_job(vehicle.vehicles)
+    # result3 = await vehicle.vehicles()
     # # Disabled due to API change
     # vinfound = False
     # for car in result3:
@@ -115,16 +132,16 @@ async def validate_input(hass: core.HomeAssistant, data):
 async def validate_vin(hass: core.HomeAssistant, data):
     configPath = hass.config.path("custom_components/fordpass/" + data[CONF_USERNAME] + "_fordpass_token.txt")
 
-    vehicle = Vehicle(data[CONF_USERNAME], data[CONF_PASSWORD], data[VIN], data[REGION], 1, configPath)
-    test = await(hass.async_add_executor_job(vehicle.get_status))
+    vehicle = AsyncVehicle(data[CONF_USERNAME], data[CONF_PASSWORD], data[VIN], data[REGION], 1, configPath)
+    try:
+        test = await vehicle.status()
+    finally:
+        await vehicle.close()
     _LOGGER.debug("GOT SOMETHING BACK?")
     _LOGGER.debug(test)
-    if test and test.status_code == 200:
-        _LOGGER.debug("200 Code")
-        return True
     if not test:
         raise InvalidVin
-    return False
+    return True
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -318,6 +335,36 @@ class OptionsFlow(config_entries.OptionsFlow):
                     UPDATE_INTERVAL, UPDATE_INTERVAL_DEFAULT
                 ),
             ): int,
+            vol.Optional(
+                ADAPTIVE_POLLING,
+                default=self.config_entry.options.get(
+                    ADAPTIVE_POLLING, ADAPTIVE_POLLING_DEFAULT
+                ),
+            ): bool,
+            vol.Optional(
+                POLL_INTERVAL_MIN,
+                default=self.config_entry.options.get(
+                    POLL_INTERVAL_MIN, POLL_INTERVAL_MIN_DEFAULT
+                ),
+            ): vol.All(int, vol.Range(min=30)),
+            vol.Optional(
+                POLL_INTERVAL_MAX,
+                default=self.config_entry.options.get(
+                    POLL_INTERVAL_MAX, POLL_INTERVAL_MAX_DEFAULT
+                ),
+            ): vol.All(int, vol.Range(min=30)),
+            vol.Optional(
+                DAILY_REQUEST_BUDGET,
+                default=self.config_entry.options.get(
+                    DAILY_REQUEST_BUDGET, DAILY_REQUEST_BUDGET_DEFAULT
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                COMMAND_SKIP_WINDOW,
+                default=self.config_entry.options.get(
+                    COMMAND_SKIP_WINDOW, COMMAND_SKIP_WINDOW_DEFAULT
+                ),
+            ): vol.All(int, vol.Range(min=0)),
 
         }
 
@@ -22,7 +22,64 @@ DISTANCE_CONVERSION_DISABLED_DEFAULT = False
 UPDATE_INTERVAL = "update_interval"
 UPDATE_INTERVAL_DEFAULT = 900
 
+# Adaptive polling picks the telemetry interval from the vehicle state,
+# the update interval option is then used while the vehicle is parked
+ADAPTIVE_POLLING = "adaptive_polling"
+ADAPTIVE_POLLING_DEFAULT = True
+POLL_INTERVAL_MIN = "poll_interval_min"
+POLL_INTERVAL_MIN_DEFAULT = 60
+POLL_INTERVAL_MAX = "poll_interval_max"
+POLL_INTERVAL_MAX_DEFAULT = 3600
+DAILY_REQUEST_BUDGET = "daily_request_budget"
+DAILY_REQUEST_BUDGET_DEFAULT = 1000
+
+# Seconds telemetry may be old and still let lock, unlock, start, stop and charge commands
+# report success without being sent when the vehicle is already in the requested state, 0 (the default) always sends
+COMMAND_SKIP_WINDOW = "command_skip_window"
+COMMAND_SKIP_WINDOW_DEFAULT = 0
+
+# Preferred telemetry interval in seconds while the vehicle is active, clamped to the min/max options
+POLL_STATE_INTERVALS = {
+    "driving": 60,
+    "remote_start": 120,
+    "charging": 120,
+    "running": 300,
+}
+
+# Refresh cadence per endpoint, keyed by the coordinator data key, all in seconds.
+# interval: how often the endpoint is fetched (telemetry follows the update interval option)
+# ttl: how long the last payload is kept when fetches keep failing (None keeps it forever)
+# timeout: how long a single fetch may take before it is treated as failed
+ENDPOINTS = {
+    "status": {"interval": 0, "ttl": None, "timeout": 30},
+    "messages": {"interval": 3600, "ttl": 86400, "timeout": 20},
+    "vehicles": {"interval": 21600, "ttl": None, "timeout": 30},
+    "guardstatus": {"interval": 1800, "ttl": 7200, "timeout": 20},
+    "energytransferstatus": {"interval": 1800, "ttl": 7200, "timeout": 20},
+    "rccstatus": {"interval": 3600, "ttl": 14400, "timeout": 20},
+}
+
+# Telemetry keys always requested, the coordinator needs them for polling and endpoint decisions
+STATUS_CORE_KEYS = [
+    "metrics.speed",
+    "metrics.ignitionStatus",
+    "metrics.remoteStartCountdownTimer",
+    "metrics.xevPlugChargerStatus",
+    "metrics.xevBatteryChargeDisplayStatus",
+    "states.commandPreclusion",
+    "metrics.deepSleepInProgress",
+]
+# Seconds between full status payloads, the ones in between only ask for the keys enabled entities read
+STATUS_FULL_INTERVAL = 21600
+
+# The last good payload is saved so entities can be set up from it while the API is slow or down
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+# Seconds after which a saved payload is too old to show as the vehicle state
+SNAPSHOT_MAX_AGE = 172800
+
 COORDINATOR = "coordinator"
+ACCOUNTS = "accounts"
 
 
 REGION = "region"
@@ -59,6 +116,7 @@ SENSORS = {
     "messages": {"icon": "mdi:message-text", "api_key": "messages", "measurement": "messages", "sensor_type": "single"},
     "dieselSystemStatus": {"icon": "mdi:smoking-pipe", "api_key": "dieselExhaustFilterStatus"},
     "exhaustFluidLevel": {"icon": "mdi:barrel", "api_key": "dieselExhaustFluidLevel", "measurement": "%"},
+    "requestBudget": {"icon": "mdi:speedometer", "api_key": "requestBudget", "measurement": "requests", "sensor_type": "single", "diagnostic": True},
     # Debug Sensors (Disabled by default)
     "events": {"icon": "mdi:calendar", "api_key": "events", "sensor_type": "single", "debug": True},
     "metrics": {"icon": "mdi:chart-line", "api_key": "metrics", "sensor_type": "single", "debug": True},
@@ -66,6 +124,59 @@ SENSORS = {
     "vehicles": {"icon": "mdi:car-multiple", "api_key": "vehicles", "sensor_type": "single", "debug": True}
 }
 
+# Coordinator data keys each entity reads, an entity only writes state when one of them changed.
+# Telemetry keys are "<section>.<name>", entries ending in * match by prefix. Entities missing here always update
+# and need the full payload, an empty list always updates but reads no telemetry
+SENSOR_DEPENDENCIES = {
+    "odometer": ["metrics.odometer"],
+    "fuel": ["metrics.fuelLevel", "metrics.fuelRange", "metrics.xevBatteryStateOfCharge", "metrics.xevBatteryRange"],
+    "battery": ["metrics.batteryStateOfCharge", "metrics.batteryVoltage"],
+    "oil": ["metrics.oilLifeRemaining"],
+    "tirePressure": ["metrics.tirePressure", "metrics.tirePressureSystemStatus"],
+    "alarm": ["metrics.alarmStatus"],
+    "ignitionStatus": ["metrics.ignitionStatus"],
+    "doorStatus": ["metrics.doorStatus", "metrics.hoodStatus"],
+    "windowPosition": ["metrics.windowStatus"],
+    "lastRefresh": ["updateTime"],
+    "elVeh": ["metrics.xev*", "metrics.tripXev*", "metrics.customMetrics", "events.customEvents"],
+    "elVehCharging": ["metrics.xev*"],
+    "speed": [
+        "metrics.speed", "metrics.acceleratorPedalPosition", "metrics.brakePedalStatus", "metrics.brakeTorque", "metrics.engineSpeed",
+        "metrics.gearLeverPosition", "metrics.parkingBrakeStatus", "metrics.torqueAtTransmission", "metrics.tripFuelEconomy", "metrics.xevBatteryVoltage"
+    ],
+    "indicators": ["metrics.indicators"],
+    "coolantTemp": ["metrics.engineCoolantTemp"],
+    "outsideTemp": ["metrics.outsideTemperature", "metrics.ambientTemp"],
+    "engineOilTemp": ["metrics.engineOilTemp"],
+    "deepSleep": ["states.commandPreclusion"],
+    "remoteStartStatus": ["metrics.remoteStartCountdownTimer"],
+    "messages": ["messages"],
+    "dieselSystemStatus": ["metrics.dieselExhaustFilterStatus", "metrics.indicators"],
+    "exhaustFluidLevel": ["metrics.dieselExhaustFluidLevel", "metrics.dieselExhaustFluidLevelRangeRemaining", "metrics.indicators"],
+    "requestBudget": [],
+    "events": ["events.*"],
+    "metrics": ["metrics.*"],
+    "states": ["states.*"],
+    "vehicles": ["vehicles"],
+}
+
+SWITCH_DEPENDENCIES = {
+    "ignition": ["metrics.ignitionStatus", "metrics.engineStatus"],
+    "charging": ["metrics.xevPlugChargerStatus"],
+    "guardmode": ["guardstatus"],
+    "zone_lighting": ["metrics.zoneLighting"],
+    "zone_front": ["metrics.zoneLighting", "metrics.zoneLightingFront"],
+    "zone_rear": ["metrics.zoneLighting", "metrics.zoneLightingRear"],
+    "zone_left": ["metrics.zoneLighting", "metrics.zoneLightingLeft"],
+    "zone_right": ["metrics.zoneLighting", "metrics.zoneLightingRight"],
+    "defrost": ["vehicles"],
+    "heated_seats": ["vehicles"],
+    "cooled_seats": ["vehicles"],
+}
+
+LOCK_DEPENDENCIES = ["metrics.doorLockStatus"]
+TRACKER_DEPENDENCIES = ["metrics.position"]
+
 SWITCHES = {
     "ignition": {"icon": "mdi:engine"},
     #"guardmode": {"icon": "mdi:shield-car"},
@@ -5,7 +5,7 @@ from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 
 from . import FordPassEntity
-from .const import DOMAIN, COORDINATOR
+from .const import DOMAIN, COORDINATOR, TRACKER_DEPENDENCIES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     entry = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
 
     # Added a check to see if the car supports GPS
-    if "position" in entry.data["metrics"] and entry.data["metrics"]["position"] is not None:
+    if entry.reports("metrics.position"):
         async_add_entities([CarTracker(entry, "gps")], True)
     else:
         _LOGGER.debug("Vehicle does not support GPS")
@@ -27,20 +27,35 @@ class CarTracker(FordPassEntity, TrackerEntity):
         self._attr = {}
         self.sensor = sensor
         self.coordinator = coordinator
-        self.data = coordinator.data["metrics"]
+        self.dependencies = TRACKER_DEPENDENCIES
         self._device_id = "fordpass_tracker"
         # Required for HA 2022.7
         self.coordinator_context = object()
 
+    def _position(self):
+        """Return latitude, longitude and attributes, computed once per coordinator refresh"""
+        return self.cached(self._compute_position)
+
+    def _compute_position(self):
+        position = self.coordinator.telemetry.value("position")
+        atts = {}
+        if "alt" in position["location"]:
+            atts["Altitude"] = position["location"]["alt"]
+        if "gpsCoordinateMethod" in position:
+            atts["gpsCoordinateMethod"] = position["gpsCoordinateMethod"]
+        if "gpsDimension" in position:
+            atts["gpsDimension"] = position["gpsDimension"]
+        return float(position["location"]["lat"]), float(position["location"]["lon"]), atts
+
     @property
     def latitude(self):
         """Return latitude"""
-        return float(self.coordinator.data["metrics"]["position"]["value"]["location"]["lat"])
+        return self._position()[0]
 
     @property
     def longitude(self):
         """Return longtitude"""
-        return float(self.coordinator.data["metrics"]["position"]["value"]["location"]["lon"])
+        return self._position()[1]
 
     @property
     def source_type(self):
@@ -59,14 +74,7 @@ class CarTracker(FordPassEntity, TrackerEntity):
 
     @property
     def extra_state_attributes(self):
-        atts = {}
-        if "alt" in self.coordinator.data["metrics"]["position"]["value"]["location"]:
-            atts["Altitude"] = self.coordinator.data["metrics"]["position"]["value"]["location"]["alt"]
-        if "gpsCoordinateMethod" in self.coordinator.data["metrics"]["position"]["value"]:
-            atts["gpsCoordinateMethod"] = self.coordinator.data["metrics"]["position"]["value"]["gpsCoordinateMethod"]
-        if "gpsDimension" in self.coordinator.data["metrics"]["position"]["value"]:
-            atts["gpsDimension"] = self.coordinator.data["metrics"]["position"]["value"]["gpsDimension"]
-        return atts
+        return self._position()[2]
 
     @property
     def icon(self):
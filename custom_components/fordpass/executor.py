@@ -0,0 +1,106 @@
+"""Bounded worker pool and per-vehicle lanes for FordPass work"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+# Threads for blocking work, kept small so FordPass never ties up the shared executor
+EXECUTOR_WORKERS = 2
+
+# Jobs that may run at once in each lane of a vehicle (or token file), the rest queue in order
+LANE_LIMITS = {"telemetry": 1, "commands": 1, "io": 1}
+
+# Log when this many jobs are waiting in one lane
+QUEUE_WARNING = 5
+
+
+class Lane:
+    """Limits concurrent jobs for one vehicle and keeps queue metrics"""
+
+    def __init__(self, name, limit):
+        self.name = name
+        self.limit = limit
+        self.running = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        if self.waiting >= QUEUE_WARNING:
+            _LOGGER.warning("%s jobs waiting in FordPass lane %s", self.waiting, self.name)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.running -= 1
+        self.completed += 1
+        self._semaphore.release()
+
+    def stats(self):
+        """Return the queue metrics of the lane"""
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+        }
+
+
+class FordPassExecutor:
+    """Runs blocking jobs on a pool owned by the integration, queued per vehicle lane"""
+
+    def __init__(self, max_workers=EXECUTOR_WORKERS):
+        self.max_workers = max_workers
+        self._pool = None
+        self._lanes = {}
+
+    def lane(self, key, name):
+        """Return the lane of a vehicle, use it with async with to hold a slot"""
+        lane = self._lanes.get((key, name))
+        if lane is None:
+            lane = Lane(f"{key}/{name}", LANE_LIMITS.get(name, 1))
+            self._lanes[(key, name)] = lane
+        return lane
+
+    async def run(self, key, name, func, *args):
+        """Run a blocking function on the pool once the lane has a free slot"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="fordpass")
+        async with self.lane(key, name):
+            return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    def stats(self, key=None):
+        """Return queue metrics of every lane, or by lane name of the lanes of one vehicle"""
+        if key is None:
+            return {lane.name: lane.stats() for lane in self._lanes.values()}
+        return {name: lane.stats() for (lane_key, name), lane in self._lanes.items() if lane_key == key}
+
+    def release(self, key):
+        """Forget the lanes of a vehicle that is no longer used"""
+        for lane_key in [lane_key for lane_key in self._lanes if lane_key[0] == key]:
+            del self._lanes[lane_key]
+
+    def shutdown(self):
+        """Stop the worker threads, a later job starts a new pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+_EXECUTOR = None
+
+
+def get_executor():
+    """Return the executor shared by every FordPass client in the process"""
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        _EXECUTOR = FordPassExecutor()
+    return _EXECUTOR
@@ -1,4 +1,6 @@
 """Fordpass API Library"""
+import asyncio
+import copy
 import hashlib
 import json
 import logging
@@ -8,11 +10,18 @@ import re
 import string
 import time
 from base64 import urlsafe_b64encode
-import requests
-
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from.const import REGIONS
+from datetime import datetime, timezone
+from functools import partial
+from urllib.parse import urlparse
+
+from .batching import CommandQueue
+from .commands import EXPIRED, FAILED, PRECLUDED, SUCCESS, CommandEngine
+from .const import REGIONS
+from .executor import get_executor
+from .singleflight import SingleFlight
+from .telemetry import project, query_body
+from .tokens import TokenManager, TokenStore
+from .transport import Transport
 
 _LOGGER = logging.getLogger(__name__)
 defaultHeaders = {
@@ -40,17 +49,45 @@ BASE_URL = "https://usapi.cv.ford.com/api"
 GUARD_URL = "https://api.mps.ford.com/api"
 SSO_URL = "https://sso.ci.ford.com"
 AUTONOMIC_URL = "https://api.autonomic.ai/v1"
+AUTONOMIC_BETA_URL = "https://api.autonomic.ai/v1beta"
 AUTONOMIC_ACCOUNT_URL = "https://accounts.autonomic.ai/v1"
 FORD_LOGIN_URL = "https://login.ford.com"
 
-session = requests.Session()
+# Autonomic command toState values that end a command
+COMMAND_STATES = {
+    "success": SUCCESS,
+    "expired": EXPIRED,
+    "failed": FAILED,
+}
+
+# Telemetry read to tell whether the vehicle can take commands
+PRECLUSION_KEYS = {"states.commandPreclusion", "metrics.deepSleepInProgress"}
+
+# Telemetry showing a command would change nothing, keyed by command: the metric and a test of its value
+COMMAND_TARGETS = {
+    "lock": ("doorLockStatus", lambda value: value == "LOCKED"),
+    "unlock": ("doorLockStatus", lambda value: value == "UNLOCKED"),
+    "remoteStart": ("remoteStartCountdownTimer", lambda value: (value or 0) > 0),
+    "cancelRemoteStart": ("remoteStartCountdownTimer", lambda value: (value or 0) == 0),
+    "startCharge": ("xevPlugChargerStatus", lambda value: str(value).upper() == "CHARGING"),
+    "stopCharge": ("xevPlugChargerStatus", lambda value: str(value).upper() != "CHARGING"),
+}
 
+# Responses to the telemetry :query endpoint that mean it can't be used, full status requests are used instead
+QUERY_UNSUPPORTED = (400, 404, 405, 415, 501)
+# RCC profile settings sent for the ones that were never set, the profile update always carries all of them
+RCC_PROFILE_DEFAULTS = {"hvac": 22, "seats": "Off", "defrost": "Off"}
+# Zones that together make up "All" for zone lighting, with the metric reporting each of them
+LIGHTING_ZONES = {"Front": "zoneLightingFront", "Rear": "zoneLightingRear", "Driver": "zoneLightingLeft", "Passenger": "zoneLightingRight"}
+# Seconds a telemetry payload is reused by other callers, e.g. a refresh right after a command check
+STATUS_FRESHNESS = 5
 
-class Vehicle:
+
+class AsyncVehicle:
     # Represents a Ford vehicle, with methods for status and issuing commands
 
     def __init__(
-        self, username, password, vin, region, save_token=False, config_location=""
+        self, username, password, vin, region, save_token=False, config_location="", session=None
     ):
         self.username = username
         self.password = password
@@ -60,27 +97,91 @@ class Vehicle:
         self.short_code = REGIONS[region]["locale_short"]
         self.countrycode = REGIONS[region]["countrycode"]
         self.vin = vin
-        self.token = None
-        self.expires = None
-        self.expires_at = None
-        self.refresh_token = None
-        self.auto_token = None
-        self.auto_expires_at = None
-        retry = Retry(connect=3, backoff_factor=0.5)
-        adapter = HTTPAdapter(max_retries=retry)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        # Seconds telemetry may be old and still let a command that would change nothing report success unsent, 0 always sends
+        self.skip_window = 0
+        self._metrics = {}
+        self._states = {}
+        self._commanded = {}
+        self.tokens = TokenManager()
+        self.commands = CommandEngine()
+        self._queue = CommandQueue()
+        # RCC profile last sent, fields a coalesced update doesn't set are taken from it
+        self._rcc_profile = {}
+        self._transport = Transport(session)
+        self._own_transport = True
+        self._auth_lock = asyncio.Lock()
         if config_location == "":
             self.token_location = "custom_components/fordpass/fordpass_token.txt"
         else:
             _LOGGER.debug(config_location)
             self.token_location = config_location
+        self._executor = get_executor()
+        self._store = TokenStore(self.token_location, executor=self._executor)
+        self._query_supported = True
+        self._flights = SingleFlight()
+        # Header templates, built once per vehicle and only rebuilt with the token they carry
+        self._app_headers = {**apiHeaders, "Application-Id": self.region}
+        self._ford_headers_cache = (None, None)
+        self._autonomic_headers_cache = (None, None)
+
+    @property
+    def token(self):
+        """Current FordPass access token"""
+        return self.tokens.token
+
+    @property
+    def limiter(self):
+        """Request budget and rate limits shared by every VIN on the account"""
+        return self._transport.limiter
+
+    @property
+    def auto_token(self):
+        """Current Autonomic access token"""
+        return self.tokens.auto_token
+
+    def _ford_headers(self):
+        """Headers for FordPass API calls with the current token"""
+        if self._ford_headers_cache[0] != self.token:
+            self._ford_headers_cache = (self.token, {**self._app_headers, "auth-token": self.token})
+        return self._ford_headers_cache[1]
+
+    def _autonomic_headers(self):
+        """Headers for Autonomic API calls with the current token"""
+        if self._autonomic_headers_cache[0] != self.auto_token:
+            self._autonomic_headers_cache = (self.auto_token, {**self._app_headers, "authorization": f"Bearer {self.auto_token}"})
+        return self._autonomic_headers_cache[1]
+
+    def for_vin(self, vin):
+        """Return a client for another VIN on this account sharing the transport, tokens and token file"""
+        vehicle = copy.copy(self)
+        vehicle.vin = vin
+        vehicle.commands = CommandEngine()
+        vehicle._queue = CommandQueue()
+        vehicle._rcc_profile = {}
+        vehicle._metrics = {}
+        vehicle._states = {}
+        vehicle._commanded = {}
+        vehicle._flights = SingleFlight()
+        vehicle._own_transport = False
+        return vehicle
+
+    async def close(self):
+        """Stop tracking commands, write any pending tokens and close the transport if this vehicle created it"""
+        self.commands.cancel_all()
+        self._queue.cancel_all()
+        await self._store.async_flush()
+        if self._own_transport:
+            await self._transport.close()
+
+    async def _request(self, method, url, **kwargs):
+        """Send a request through the pooled transport, the body is read before it returns"""
+        return await self._transport.request(method, url, **kwargs)
 
     def base64_url_encode(self, data):
         """Encode string to base64"""
         return urlsafe_b64encode(data).rstrip(b'=')
 
-    def generate_tokens(self, urlstring, code_verifier):
+    async def generate_tokens(self, urlstring, code_verifier):
         """Exchange the authorization code for tokens"""
         code_new = urlstring.replace("fordapp://userauthorized/?code=", "")
         data = {
@@ -94,29 +195,32 @@ class Vehicle:
         headers = {
             **loginHeaders,
         }
-        req = requests.post(
+        req = await self._request(
+            "POST",
             f"{FORD_LOGIN_URL}/4566605f-43a7-400a-946e-89cc9fdb0bd7/B2C_1A_SignInSignUp_{self.country_code}/oauth2/v2.0/token",
             headers=headers,
             data=data,
-            verify=False
+            ssl=False
         )
-        return self.generate_fulltokens(req.json())
+        return await self.generate_fulltokens(await req.json(content_type=None))
 
-    def generate_fulltokens(self, token):
+    async def generate_fulltokens(self, token):
         data = {"idpToken": token["access_token"]}
-        headers = {**apiHeaders, "Application-Id": self.region}
-        response = requests.post(
+        headers = self._app_headers
+        response = await self._request(
+            "POST",
             f"{GUARD_URL}/token/v2/cat-with-b2c-access-token",
             data=json.dumps(data),
             headers=headers,
-            verify=False
+            ssl=False
         )
-        print(response.status_code)
-        print(response.text)
-        final_tokens = response.json()
-        final_tokens["expiry_date"] = time.time() + final_tokens["expires_in"]
+        _LOGGER.debug(response.status)
+        _LOGGER.debug(await response.text())
+        final_tokens = await response.json(content_type=None)
+        self.tokens.set_ford(final_tokens)
+        self.tokens.loaded = True
 
-        self.write_token(final_tokens)
+        await self.write_token(self.tokens.as_dict())
         return True
 
     def generate_hash(self, code):
@@ -125,8 +229,23 @@ class Vehicle:
         hashengine.update(code.encode('utf-8'))
         return self.base64_url_encode(hashengine.digest()).decode('utf-8')
 
-    def auth(self):
-        """New Authentication System """
+    async def auth(self):
+        """
+        New Authentication System
+        Only one login runs per account at a time, callers that queued behind it reuse its tokens
+        Raises LoginThrottled when the account has needed too many logins recently
+        """
+        token = self.tokens.token
+        async with self._auth_lock:
+            if self.tokens.token != token and self.tokens.ford_valid():
+                _LOGGER.debug("Login already completed by another caller")
+                return True
+            self.tokens.record_login()
+            # The SSO flow runs in its own cookie jar so parallel logins and API calls never see its cookies
+            async with self._transport.isolated() as session:
+                return await self.__login(session)
+
+    async def __login(self, session):
         _LOGGER.debug("New System")
         # Auth Step1
         headers = {
@@ -136,12 +255,14 @@ class Vehicle:
         code1 = ''.join(random.choice(string.ascii_lowercase) for i in range(43))
         code_verifier = self.generate_hash(code1)
         url1 = f"{SSO_URL}/v1.0/endpoint/default/authorize?redirect_uri=fordapp://userauthorized&response_type=code&scope=openid&max_age=3600&client_id=9fb503e0-715b-47e8-adfd-ad4b7770f73b&code_challenge={code_verifier}&code_challenge_method=S256"
-        response = session.get(
+        response = await self._request(
+            "GET",
             url1,
+            session=session,
             headers=headers,
         )
 
-        test = re.findall('data-ibm-login-url="(.*)"\s', response.text)[0]
+        test = re.findall('data-ibm-login-url="(.*)"\\s', await response.text())[0]
         next_url = SSO_URL + test
 
         # Auth Step2
@@ -156,14 +277,16 @@ class Vehicle:
             "password": self.password
 
         }
-        response = session.post(
+        response = await self._request(
+            "POST",
             next_url,
             headers=headers,
             data=data,
-            allow_redirects=False
+            allow_redirects=False,
+            session=session
         )
 
-        if response.status_code == 302:
+        if response.status == 302:
             next_url = response.headers["Location"]
         else:
             response.raise_for_status()
@@ -174,15 +297,17 @@ class Vehicle:
             'Content-Type': 'application/json',
         }
 
-        response = session.get(
+        response = await self._request(
+            "GET",
             next_url,
             headers=headers,
-            allow_redirects=False
+            allow_redirects=False,
+            session=session
         )
 
-        if response.status_code == 302:
+        if response.status == 302:
             next_url = response.headers["Location"]
-            query = requests.utils.urlparse(next_url).query
+            query = urlparse(next_url).query
             params = dict(x.split('=') for x in query.split('&'))
             code = params["code"]
             grant_id = params["grant_id"]
@@ -204,15 +329,16 @@ class Vehicle:
             "code_verifier": code1
         }
 
-        response = session.post(
+        response = await self._request(
+            "POST",
             f"{SSO_URL}/oidc/endpoint/default/token",
             headers=headers,
-            data=data
-
+            data=data,
+            session=session
         )
 
-        if response.status_code == 200:
-            result = response.json()
+        if response.status == 200:
+            result = await response.json(content_type=None)
             if result["access_token"]:
                 access_token = result["access_token"]
         else:
@@ -220,160 +346,120 @@ class Vehicle:
 
         # Auth Step5
         data = {"ciToken": access_token}
-        headers = {**apiHeaders, "Application-Id": self.region}
-        response = session.post(
+        headers = self._app_headers
+        response = await self._request(
+            "POST",
             f"{GUARD_URL}/token/v2/cat-with-ci-access-token",
             data=json.dumps(data),
             headers=headers,
+            session=session
         )
 
-        if response.status_code == 200:
-            result = response.json()
+        if response.status == 200:
+            result = await response.json(content_type=None)
 
-            self.token = result["access_token"]
-            self.refresh_token = result["refresh_token"]
-            self.expires_at = time.time() + result["expires_in"]
-            auto_token = self.get_auto_token()
-            self.auto_token = auto_token["access_token"]
-            self.auto_expires_at = time.time() + result["expires_in"]
+            self.tokens.set_ford(result)
+            await self.get_auto_token()
             if self.save_token:
-                result["expiry_date"] = time.time() + result["expires_in"]
-                result["auto_token"] = auto_token["access_token"]
-                result["auto_refresh"] = auto_token["refresh_token"]
-                result["auto_expiry"] = time.time() + auto_token["expires_in"]
-
-                self.write_token(result)
-            session.cookies.clear()
+                await self.write_token(self.tokens.as_dict())
             return True
         response.raise_for_status()
         return False
 
-    def refresh_token_func(self, token):
+    async def refresh_token_func(self, token):
         """Refresh token if still valid"""
         data = {"refresh_token": token["refresh_token"]}
-        headers = {**apiHeaders, "Application-Id": self.region}
+        headers = self._app_headers
 
-        response = session.post(
+        response = await self._request(
+            "POST",
             f"{GUARD_URL}/token/v2/cat-with-refresh-token",
             data=json.dumps(data),
             headers=headers,
         )
-        if response.status_code == 200:
-            result = response.json()
+        if response.status == 200:
+            result = await response.json(content_type=None)
+            self.tokens.set_ford(result)
             if self.save_token:
-                result["expiry_date"] = time.time() + result["expires_in"]
-                self.write_token(result)
-            self.token = result["access_token"]
-            self.refresh_token = result["refresh_token"]
-            self.expires_at = time.time() + result["expires_in"]
-            _LOGGER.debug("WRITING REFRESH TOKEN")
+                _LOGGER.debug("WRITING REFRESH TOKEN")
+                await self.write_token(self.tokens.as_dict())
             return result
-        if response.status_code == 401:
+        if response.status == 401:
             _LOGGER.debug("401 response stage 2: refresh stage 1 token")
-            self.auth()
+            await self.auth()
+            return None
+        response.raise_for_status()
+        return None
 
-    def __acquire_token(self):
-        # Fetch and refresh token as needed
-        # If file exists read in token file and check it's valid
-        _LOGGER.debug("Fetching token")
+    async def __acquire_token(self):
+        # Tokens are kept in memory, the token file is only read the first time round
+        if self.save_token and not self.tokens.loaded:
+            await self.__load_tokens()
+        await self.tokens.async_ensure(self.__refresh_tokens)
+
+    async def __load_tokens(self):
+        """Load saved tokens into memory"""
+        data = await self.read_token()
+        if data:
+            _LOGGER.debug("Loaded saved tokens")
+            self.tokens.load(data)
+        self.tokens.loaded = True
+
+    async def __refresh_tokens(self):
+        """Refresh whichever tokens have expired, only ever run once at a time"""
         if self.save_token:
-            if os.path.isfile(self.token_location):
-                data = self.read_token()
-                _LOGGER.debug(f"Token data: {data}")
-                self.token = data["access_token"]
-                self.refresh_token = data["refresh_token"]
-                self.expires_at = data["expiry_date"]
-                if "auto_token" in data and "auto_expiry" in data:
-                    self.auto_token = data["auto_token"]
-                    self.auto_expires_at = data["auto_expiry"]
-                else:
-                    _LOGGER.debug("AUTO token not set in file")
-                    self.auto_token = None
-                    self.auto_expires_at = None
-            else:
-                data = {}
-                data["access_token"] = self.token
-                data["refresh_token"] = self.refresh_token
-                data["expiry_date"] = self.expires_at
-                data["auto_token"] = self.auto_token
-                data["auto_expiry"] = self.auto_expires_at
-        else:
-            data = {}
-            data["access_token"] = self.token
-            data["refresh_token"] = self.refresh_token
-            data["expiry_date"] = self.expires_at
-            data["auto_token"] = self.auto_token
-            data["auto_expiry"] = self.auto_expires_at
-        _LOGGER.debug(self.auto_token)
-        _LOGGER.debug(self.auto_expires_at)
-        if self.auto_token is None or self.auto_expires_at is None:
-            result = self.refresh_token_func(data)
-            _LOGGER.debug("Result Above for new TOKEN")
-            self.refresh_auto_token(result)
-        # self.auto_token = data["auto_token"]
-        # self.auto_expires_at = data["auto_expiry"]
-        if self.expires_at:
-            if time.time() >= self.expires_at:
-                _LOGGER.debug("No token, or has expired, requesting new token")
-                self.refresh_token_func(data)
-                # self.auth()
-        if self.auto_expires_at:
-            if time.time() >= self.auto_expires_at:
-                _LOGGER.debug("Autonomic token expired")
-                result = self.refresh_token_func(data)
-                _LOGGER.debug("Result Above for new TOKEN")
-                self.refresh_auto_token(result)
-        if self.token is None:
-            _LOGGER.debug("Fetching token4")
-            # No existing token exists so refreshing library
-            self.auth()
-        else:
-            _LOGGER.debug("Token is valid, continuing")
-
-    def write_token(self, token):
-        """Save token to file for reuse"""
-        with open(self.token_location, "w", encoding="utf-8") as outfile:
-            token["expiry_date"] = time.time() + token["expires_in"]
-            _LOGGER.debug(token)
-            json.dump(token, outfile)
-
-    def read_token(self):
+            # Another instance using the same account may have refreshed already
+            mtime = await self._executor.run(self.token_location, "io", self._store.read_mtime)
+            if mtime is not None and mtime != self._store.mtime:
+                await self.__load_tokens()
+                if self.tokens.is_valid():
+                    _LOGGER.debug("Using tokens refreshed by another instance")
+                    return
+        if self.tokens.refresh_token is None:
+            _LOGGER.debug("No existing token, running full login")
+            await self.auth()
+            return
+        if not self.tokens.ford_valid():
+            _LOGGER.debug("No token, or has expired, requesting new token")
+            await self.refresh_token_func(self.tokens.as_dict())
+        if not self.tokens.auto_valid():
+            _LOGGER.debug("Autonomic token expired")
+            await self.refresh_auto_token(self.tokens.as_dict())
+
+    async def write_token(self, token):
+        """Queue token to be saved to file for reuse"""
+        self._store.schedule(token)
+
+    async def read_token(self):
         """Read saved token from file"""
-        try:
-            with open(self.token_location, encoding="utf-8") as token_file:
-                token = json.load(token_file)
-                return token
-        except ValueError:
-            _LOGGER.debug("Fixing malformed token")
-            self.auth()
-            with open(self.token_location, encoding="utf-8") as token_file:
-                token = json.load(token_file)
-                return token
-
-    def clear_token(self):
+        # A token file that can't be parsed is ignored rather than forcing a full login,
+        # the refresh token held in memory (if any) is still used
+        return await self._executor.run(self.token_location, "io", self._store.load)
+
+    async def clear_token(self):
         """Clear tokens from config directory"""
+        self._store.discard()
+        await self._executor.run(self.token_location, "io", self._remove_token_files)
+        self.tokens.clear()
+
+    def _remove_token_files(self):
         if os.path.isfile("/tmp/fordpass_token.txt"):
             os.remove("/tmp/fordpass_token.txt")
         if os.path.isfile("/tmp/token.txt"):
             os.remove("/tmp/token.txt")
-        if os.path.isfile(self.token_location):
-            os.remove(self.token_location)
+        self._store.remove()
 
-    def refresh_auto_token(self, result):
-        auto_token = self.get_auto_token()
+    async def refresh_auto_token(self, result):
+        """Exchange the FordPass token for a new Autonomic token"""
         _LOGGER.debug("AUTO Refresh")
-        self.auto_token = auto_token["access_token"]
-        self.auto_token_refresh = auto_token["refresh_token"]
-        self.auto_expires_at = time.time() + auto_token["expires_in"]
+        if not await self.get_auto_token():
+            _LOGGER.debug("Autonomic token exchange failed")
+            return False
         if self.save_token:
-            # result["expiry_date"] = time.time() + result["expires_in"]
-            result["auto_token"] = auto_token["access_token"]
-            result["auto_refresh"] = auto_token["refresh_token"]
-            result["auto_expiry"] = time.time() + auto_token["expires_in"]
-
-            self.write_token(result)
+            await self.write_token(self.tokens.as_dict())
+        return True
 
-    def get_auto_token(self):
+    async def get_auto_token(self):
         """Get token from new autonomic API"""
         _LOGGER.debug("Getting Auto Token")
         headers = {
@@ -390,106 +476,137 @@ class Vehicle:
 
         }
 
-        r = session.post(
+        r = await self._request(
+            "POST",
             f"{AUTONOMIC_ACCOUNT_URL}/auth/oidc/token",
             data=data,
             headers=headers
         )
 
-        if r.status_code == 200:
-            result = r.json()
-            _LOGGER.debug(r.status_code)
-            _LOGGER.debug(f"Auto Token response? {r.text}")
-            self.auto_token = result["access_token"]
+        if r.status == 200:
+            result = await r.json(content_type=None)
+            _LOGGER.debug(r.status)
+            self.tokens.set_auto(result)
             return result
         return False
 
-    def status(self):
-        """Get Vehicle status from API"""
+    async def status(self, keys=None):
+        """
+        Get Vehicle status from API
+        keys limits the metrics, states and events returned to the given "<section>.<name>" keys
+        Identical calls in flight share one request, and a full payload fetched in the last few seconds
+        or still in flight answers any call
+        """
+        full = self._flights.fresh("status", STATUS_FRESHNESS)
+        if full is None and keys is not None and self._flights.pending("status") is not None:
+            full = await asyncio.shield(self._flights.pending("status"))
+        if full is None:
+            key = "status" if keys is None else ("status", frozenset(keys))
+            result = await self._flights.run(key, partial(self.__status_in_lane, keys), STATUS_FRESHNESS)
+        else:
+            result = full if keys is None else project(full, keys)
+        if result:
+            self.__keep_status(result, keys)
+        # Callers add their own keys to the payload, keep the shared one untouched
+        return dict(result) if result else result
 
-        self.__acquire_token()
+    def __keep_status(self, result, keys):
+        """
+        Replace the metrics and states kept for command checks with a payload, a projected one only
+        replaces the keys it was asked for so entries the vehicle stopped reporting don't linger
+        """
+        if keys is None:
+            self._metrics = dict(result.get("metrics") or {})
+            self._states = dict(result.get("states") or {})
+            return
+        for key in keys:
+            section, _, name = key.partition(".")
+            kept = {"metrics": self._metrics, "states": self._states}.get(section)
+            if kept is None:
+                continue
+            entry = (result.get(section) or {}).get(name)
+            if entry is None:
+                kept.pop(name, None)
+            else:
+                kept[name] = entry
+
+    async def __status_in_lane(self, keys):
+        """Fetch telemetry once no other fetch for the vehicle is running"""
+        async with self._executor.lane(self.vin, "telemetry"):
+            return await self.__status(keys)
+
+    async def __status(self, keys):
+        await self.__acquire_token()
 
         params = {"lrdt": "01-01-1970 00:00:00"}
 
-        headers = {
-            **apiHeaders,
-            "auth-token": self.token,
-            "Application-Id": self.region,
-        }
+        headers = self._ford_headers()
         _LOGGER.debug(f"Auto Token: {self.auto_token}")
 
         if NEW_API:
-            headers = {
-                **apiHeaders,
-                "authorization": f"Bearer {self.auto_token}",
-                "Application-Id": self.region,
-            }
-            r = session.get(
-                f"{AUTONOMIC_URL}/telemetry/sources/fordpass/vehicles/{self.vin}", params=params, headers=headers
+            headers = self._autonomic_headers()
+            if keys is not None and self._query_supported:
+                r = await self._request(
+                    "POST", f"{AUTONOMIC_BETA_URL}/telemetry/sources/fordpass/vehicles/{self.vin}:query", headers=headers, json=query_body(keys)
+                )
+                if r.status == 200:
+                    # Prune as well in case the server ignored the projection
+                    return project(await r.json(content_type=None), keys)
+                if r.status in QUERY_UNSUPPORTED:
+                    _LOGGER.debug("Telemetry query not supported (%s), requesting full status instead", r.status)
+                    self._query_supported = False
+            r = await self._request(
+                "GET", f"{AUTONOMIC_URL}/telemetry/sources/fordpass/vehicles/{self.vin}", params=params, headers=headers
             )
-            if r.status_code == 200:
-                #_LOGGER.debug(f"New API response? {r.text}")
-                result = r.json()
-                return result
-        else:
-            response = session.get(
-                f"{BASE_URL}/vehicles/v5/{self.vin}/status", params=params, headers=headers
+            if r.status == 200:
+                result = await r.json(content_type=None)
+                return result if keys is None else project(result, keys)
+            return None
+        response = await self._request(
+            "GET", f"{BASE_URL}/vehicles/v5/{self.vin}/status", params=params, headers=headers
+        )
+        if response.status == 200:
+            result = await response.json(content_type=None)
+            if result["status"] == 402:
+                response.raise_for_status()
+            return result["vehiclestatus"]
+        if response.status == 401:
+            _LOGGER.debug("401 with status request: start token refresh")
+            await self.refresh_token_func(self.tokens.as_dict())
+            await self.__acquire_token()
+            headers = self._ford_headers()
+            response = await self._request(
+                "GET",
+                f"{BASE_URL}/vehicles/v5/{self.vin}/status",
+                params=params,
+                headers=headers,
             )
-            if response.status_code == 200:
-                result = response.json()
-                if result["status"] == 402:
-                    response.raise_for_status()
-                return result["vehiclestatus"]
-            if response.status_code == 401:
-                _LOGGER.debug("401 with status request: start token refresh")
-                data = {}
-                data["access_token"] = self.token
-                data["refresh_token"] = self.refresh_token
-                data["expiry_date"] = self.expires_at
-                self.refresh_token_func(data)
-                self.__acquire_token()
-                headers = {
-                    **apiHeaders,
-                    "auth-token": self.token,
-                    "Application-Id": self.region,
-                }
-                response = session.get(
-                    f"{BASE_URL}/vehicles/v5/{self.vin}/status",
-                    params=params,
-                    headers=headers,
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                return result["vehiclestatus"]
-            response.raise_for_status()
+            if response.status == 200:
+                result = await response.json(content_type=None)
+            return result["vehiclestatus"]
+        response.raise_for_status()
+        return None
 
-    def messages(self):
+    async def messages(self):
         """Get Vehicle messages from API"""
-        self.__acquire_token()
-        headers = {
-            **apiHeaders,
-            "Auth-Token": self.token,
-            "Application-Id": self.region,
-        }
-        response = session.get(f"{GUARD_URL}/messagecenter/v3/messages?", headers=headers)
-        if response.status_code == 200:
-            result = response.json()
+        await self.__acquire_token()
+        headers = self._ford_headers()
+        response = await self._request("GET", f"{GUARD_URL}/messagecenter/v3/messages?", headers=headers)
+        if response.status == 200:
+            result = await response.json(content_type=None)
             return result["result"]["messages"]
-            # _LOGGER.debug(result)
-        _LOGGER.debug(f"Message response: {response.text}")
-        if response.status_code == 401:
-            self.auth()
+        _LOGGER.debug(f"Message response: {await response.text()}")
+        if response.status == 401:
+            await self.auth()
         response.raise_for_status()
         return None
 
-    def vehicles(self):
+    async def vehicles(self):
         """Get vehicle list from account"""
-        self.__acquire_token()
+        await self.__acquire_token()
 
         headers = {
-            **apiHeaders,
-            "Auth-Token": self.token,
-            "Application-Id": self.region,
+            **self._ford_headers(),
             "Countrycode": self.countrycode,
             "Locale": "EN-US"
         }
@@ -497,137 +614,162 @@ class Vehicle:
         data = {
             "dashboardRefreshRequest": "All"
         }
-        response = session.post(
+        response = await self._request(
+            "POST",
             f"{GUARD_URL}/expdashboard/v1/details/",
             headers=headers,
             data=json.dumps(data)
         )
-        if response.status_code == 207:
-            result = response.json()
+        if response.status == 207:
+            result = await response.json(content_type=None)
 
             _LOGGER.debug(result)
             return result
-        _LOGGER.debug(f"Vehicle response: {response.text}")
-        if response.status_code == 401:
-            self.auth()
+        _LOGGER.debug(f"Vehicle response: {await response.text()}")
+        if response.status == 401:
+            await self.auth()
         response.raise_for_status()
         return None
 
-    def guard_status(self):
+    async def guard_status(self):
         """Retrieve guard status from API"""
-        self.__acquire_token()
+        await self.__acquire_token()
 
         params = {"lrdt": "01-01-1970 00:00:00"}
 
-        headers = {
-            **apiHeaders,
-            "auth-token": self.token,
-            "Application-Id": self.region,
-        }
+        headers = self._ford_headers()
 
-        response = session.get(
+        response = await self._request(
+            "GET",
             f"{GUARD_URL}/guardmode/v1/{self.vin}/session",
             params=params,
             headers=headers,
         )
-        return response.json()
+        response.raise_for_status()
+        return await response.json(content_type=None)
 
-    def start(self):
+    async def start(self):
         """
         Issue a start command to the engine
         """
-        return self.__request_and_poll_command("remoteStart")
+        return await self.__request_and_poll_command("remoteStart")
 
-    def stop(self):
+    async def stop(self):
         """
         Issue a stop command to the engine
         """
-        return self.__request_and_poll_command("cancelRemoteStart")
+        return await self.__request_and_poll_command("cancelRemoteStart")
 
-    def lock(self):
+    async def lock(self):
         """
         Issue a lock command to the doors
         """
-        return self.__request_and_poll_command("lock")
+        return await self.__request_and_poll_command("lock")
 
-    def unlock(self):
+    async def unlock(self):
         """
         Issue an unlock command to the doors
         """
-        return self.__request_and_poll_command("unlock")
+        return await self.__request_and_poll_command("unlock")
 
-    def enable_guard(self):
+    async def enable_guard(self):
         """
         Enable Guard mode on supported models
         """
-        self.__acquire_token()
+        await self.__acquire_token()
 
-        response = self.__make_request(
+        response = await self.__make_request(
             "PUT", f"{GUARD_URL}/guardmode/v1/{self.vin}/session", None, None
         )
-        _LOGGER.debug(f"Guard response: {response.text}")
+        _LOGGER.debug(f"Guard response: {await response.text()}")
         return response
 
-    def disable_guard(self):
+    async def disable_guard(self):
         """
         Disable Guard mode on supported models
         """
-        self.__acquire_token()
-        response = self.__make_request(
+        await self.__acquire_token()
+        response = await self.__make_request(
             "DELETE", f"{GUARD_URL}/guardmode/v1/{self.vin}/session", None, None
         )
-        _LOGGER.debug(f"Guard disableresponse: {response.text}")
+        _LOGGER.debug(f"Guard disableresponse: {await response.text()}")
         return response
 
-    def request_update(self, vin=""):
+    async def request_update(self, vin=""):
         """Send request to vehicle for update"""
-        self.__acquire_token()
+        await self.__acquire_token()
         if vin:
             vinnum = vin
         else:
             vinnum = self.vin
-        status = self.__request_and_poll_command("statusRefresh", vinnum)
+        status = await self.__request_and_poll_command("statusRefresh", vinnum)
         return status
 
-    def __make_request(self, method, url, data, params):
+    async def __make_request(self, method, url, data, params):
         """
         Make a request to the given URL, passing data/params as needed
         """
 
-        headers = {
-            **apiHeaders,
-            "auth-token": self.token,
-            "Application-Id": self.region,
-        }
+        headers = self._ford_headers()
 
-        return getattr(requests, method.lower())(
-            url, headers=headers, data=data, params=params
+        return await self._request(
+            method, url, headers=headers, data=data, params=params
         )
 
-    def __poll_status(self, url, command_id):
+    async def __check_legacy_command(self, url, command_id):
         """
-        Poll the given URL with the given command ID until the command is completed
+        Check the given URL for the state of a command, None while it is still pending
         """
-        status = self.__make_request("GET", f"{url}/{command_id}", None, None)
-        result = status.json()
+        status = await self.__make_request("GET", f"{url}/{command_id}", None, None)
+        result = await status.json(content_type=None)
         if result["status"] == 552:
             _LOGGER.debug("Command is pending")
-            time.sleep(5)
-            return self.__poll_status(url, command_id)  # retry after 5s
+            return None
         if result["status"] == 200:
             _LOGGER.debug("Command completed succesfully")
-            return True
+            return SUCCESS
         _LOGGER.debug("Command failed")
-        return False
+        return FAILED
 
-    def __request_and_poll_command(self, command, vin=None):
-        """Send command to the new Command endpoint"""
-        self.__acquire_token()
-        headers = {
-            **apiHeaders,
-            "Application-Id": self.region,
-            "authorization": f"Bearer {self.auto_token}"
-        }
+    def submit_command(self, command, deadline=None, callback=None):
+        """
+        Send a command to the new Command endpoint without waiting for it.
+        The returned Command can be awaited for its final state, cancelled or given a callback.
+        While live telemetry says the vehicle precludes commands it fails straight away.
+        """
+        return self.commands.submit(
+            command,
+            partial(self.__send_in_lane, command),
+            partial(self.__check_command, command),
+            deadline,
+            callback,
+            self.__commandable,
+        )
+
+    def preclusion(self):
+        """Return why the last telemetry says the vehicle won't take commands, or None"""
+        state = ((self._states.get("commandPreclusion") or {}).get("value") or {}).get("toState")
+        if state == "COMMANDS_PRECLUDED":
+            return "Vehicle is in deep sleep and precludes commands"
+        if (self._metrics.get("deepSleepInProgress") or {}).get("value") is True:
+            return "Vehicle is going into deep sleep"
+        return None
+
+    async def __commandable(self, refresh):
+        if refresh:
+            await self.status(PRECLUSION_KEYS)
+        return self.preclusion()
+
+    async def __send_in_lane(self, command):
+        """Send a command once no other command for the vehicle is being sent"""
+        async with self._executor.lane(self.vin, "commands"):
+            return await self.__send_command(command)
+
+    async def __send_command(self, command):
+        """Post a command, returning its id or None if it was rejected"""
+        self.__commanded(command)
+        await self.__acquire_token()
+        headers = self._autonomic_headers()
 
         data = {
             "properties": {},
@@ -635,164 +777,183 @@ class Vehicle:
             "type": command,
             "wakeUp": True
         }
-        if vin is None:
-            r = session.post(
-                f"{AUTONOMIC_URL}/command/vehicles/{self.vin}/commands",
-                data=json.dumps(data),
-                headers=headers
-            )
-        else:
-            r = session.post(
-                f"{AUTONOMIC_URL}/command/vehicles/{self.vin}/commands",
-                data=json.dumps(data),
-                headers=headers
-            )
+        r = await self._request(
+            "POST",
+            f"{AUTONOMIC_URL}/command/vehicles/{self.vin}/commands",
+            data=json.dumps(data),
+            headers=headers
+        )
 
         _LOGGER.debug("Testing command")
-        _LOGGER.debug(r.status_code)
-        _LOGGER.debug(r.text)
-        if r.status_code == 201:
-            # New code to hanble checking states table from vehicle data
-            response = r.json()
-            command_id = response["id"]
-            i = 1
-            while i < 14:
-                # Check status every 10 seconds for 90 seconds until command completes or time expires
-                status = self.status()
-                _LOGGER.debug("STATUS")
-                _LOGGER.debug(status)
-
-                if "states" in status:
-                    _LOGGER.debug("States located")
-                    if f"{command}Command" in status["states"]:
-                        _LOGGER.debug("Found command")
-                        _LOGGER.debug(status["states"][f"{command}Command"]["commandId"])
-                        if status["states"][f"{command}Command"]["commandId"] == command_id:
-                            _LOGGER.debug("Making progress")
-                            _LOGGER.debug(status["states"][f"{command}Command"])
-                            if status["states"][f"{command}Command"]["value"]["toState"] == "success":
-                                _LOGGER.debug("Command succeeded")
-                                return True
-                            if status["states"][f"{command}Command"]["value"]["toState"] == "expired":
-                                _LOGGER.debug("Command expired")
-                                return False
-                i += 1
-                _LOGGER.debug("Looping again")
-                time.sleep(10)
-            # time.sleep(90)
+        _LOGGER.debug(r.status)
+        _LOGGER.debug(await r.text())
+        if r.status == 201:
+            response = await r.json(content_type=None)
+            return response["id"]
+        return None
+
+    async def __check_command(self, command, command_id):
+        """Look up a command in the vehicle states table, None while it hasn't finished"""
+        status = await self.status()
+        state = ((status or {}).get("states") or {}).get(f"{command}Command")
+        if not state or state.get("commandId") != command_id:
+            return None
+        _LOGGER.debug("Making progress")
+        _LOGGER.debug(state)
+        return COMMAND_STATES.get(state.get("value", {}).get("toState"))
+
+    def already_in_state(self, command):
+        """
+        Return True if telemetry reported within skip_window, and after the last command that touched it,
+        shows the vehicle already where command would put it
+        """
+        target = COMMAND_TARGETS.get(command)
+        if not self.skip_window or target is None:
             return False
-        return False
+        metric, reached = target
+        entry = self._metrics.get(metric)
+        if isinstance(entry, list):
+            entry = entry[0] if entry else None
+        if not isinstance(entry, dict):
+            return False
+        try:
+            updated = datetime.fromisoformat(entry["updateTime"].replace("Z", "+00:00")).timestamp()
+        except (KeyError, AttributeError, ValueError):
+            return False
+        if time.time() - updated > self.skip_window or updated <= self._commanded.get(metric, 0):
+            return False
+        return reached(entry.get("value"))
 
-    def __request_and_poll(self, method, url):
+    def __commanded(self, command):
+        """Remember when a command was sent so telemetry from before it can't short-circuit the next one"""
+        if command in COMMAND_TARGETS:
+            self._commanded[COMMAND_TARGETS[command][0]] = time.time()
+
+    async def __request_and_poll_command(self, command, vin=None):
+        """Send command to the new Command endpoint and wait until the vehicle confirms it"""
+        if self.already_in_state(command):
+            _LOGGER.debug("Skipping %s for %s, telemetry shows it already done", command, self.vin)
+            return True
+        submitted = self.submit_command(command)
+        state = await submitted
+        if state == PRECLUDED:
+            _LOGGER.warning("%s was not sent to %s: %s", command, self.vin, submitted.reason)
+        return state == SUCCESS
+
+    async def __request_and_poll(self, method, url):
         """Poll API until status code is reached, locking + remote start"""
-        self.__acquire_token()
-        command = self.__make_request(method, url, None, None)
+        async def send():
+            await self.__acquire_token()
+            command = await self.__make_request(method, url, None, None)
+            if command.status == 200:
+                return (await command.json(content_type=None)).get("commandId")
+            return None
 
-        if command.status_code == 200:
-            result = command.json()
-            if "commandId" in result:
-                return self.__poll_status(url, result["commandId"])
-            return False
-        return False
-    
-    def ev_start_charge(self):
+        command = self.commands.submit(url, send, partial(self.__check_legacy_command, url))
+        return await command == SUCCESS
+
+    async def ev_start_charge(self):
         """Start EV Charge"""
-        return self.__electrification_command("CANCEL")
+        if self.already_in_state("startCharge"):
+            _LOGGER.debug("Skipping start charge for %s, telemetry shows it charging", self.vin)
+            return True
+        return await self.__electrification_command("CANCEL", "startCharge")
 
-    def ev_stop_charge(self):
+    async def ev_stop_charge(self):
         """Stop EV Charge"""
-        return self.__electrification_command("PAUSE")
+        if self.already_in_state("stopCharge"):
+            _LOGGER.debug("Skipping stop charge for %s, telemetry shows it not charging", self.vin)
+            return True
+        return await self.__electrification_command("PAUSE", "stopCharge")
 
-    def ev_energy_transfer_logs(self):
+    async def ev_energy_transfer_logs(self):
         """Get EV Energy Transfer Logs"""
         try:
-            # Debug apiHeaders
             _LOGGER.debug("EV CHARGE")
-            _LOGGER.debug("apiHeaders content: %s", apiHeaders)
-            _LOGGER.debug("apiHeaders type: %s", type(apiHeaders))
-            
+
             # Ensure we have a valid token
-            self.__acquire_token()
-            
-            # Create headers separately to debug
-            try:
-                base_headers = dict(apiHeaders)  # Convert to dict if it isn't already
-                headers = {
-                    **base_headers,
-                    "Application-Id": self.region,
-                    "authorization": f"Bearer {self.auto_token}"
-                }
-                _LOGGER.debug("Final headers: %s", headers)
-            except Exception as header_error:
-                _LOGGER.error("Error creating headers: %s", str(header_error))
-                _LOGGER.debug("Header error details:", exc_info=True)
-                return False
-            
+            await self.__acquire_token()
+
+            headers = self._autonomic_headers()
+            _LOGGER.debug("Final headers: %s", headers)
+
             # Make the request
             try:
-                r = session.get(
+                r = await self._request(
+                    "GET",
                     f"{GUARD_URL}/electrification/experiences/v1/devices/{self.vin}/energy-transfer-logs?maxRecords=20",
-                    headers=headers,
-                    timeout=30
+                    headers=headers
                 )
-                
+
                 _LOGGER.debug(f"Request URL: {r.url}")
-                _LOGGER.debug(f"Request status code: {r.status_code}")
-                
-                if r.status_code == 200:
-                    response = r.json()
+                _LOGGER.debug(f"Request status code: {r.status}")
+
+                if r.status == 200:
+                    response = await r.json(content_type=None)
                     _LOGGER.debug(f"Response content: {response}")
                     return response
-                    
+
             except Exception as request_error:
                 _LOGGER.error("Error making request: %s", str(request_error))
                 _LOGGER.debug("Request error details:", exc_info=True)
                 return False
-            
+
         except Exception as e:
             _LOGGER.error("Exception in ev_energy_transfer_logs: %s", str(e))
             _LOGGER.debug("Full exception details:", exc_info=True)
             return False
+        return None
 
-    def __rcc_status(self, vin=""):
+    async def rcc_status(self, vin=""):
         """Request Profile RCC Status"""
-        if vin:
-            vin = vin
-        else:
+        if not vin:
             vin = self.vin
-        headers = {
-            **apiHeaders,
-            "Application-Id": self.region,
-            "authorization": f"Bearer {self.auto_token}"
-        }
+        await self.__acquire_token()
+        headers = self._autonomic_headers()
         data = {
             "vin": vin
         }
 
-        r = session.post(
+        r = await self._request(
+            "POST",
             f"{GUARD_URL}/rcc/profile/status",
             headers=headers,
             data=json.dumps(data)
         )
 
-        if r.status_code == 200:
-            _LOGGER.debug(f"RCC Status: {r.status_code}")
-            response = r.json()
+        if r.status == 200:
+            _LOGGER.debug(f"RCC Status: {r.status}")
+            response = await r.json(content_type=None)
             return response
-        _LOGGER.debug(f"RCC Status: {r.status_code}")
+        _LOGGER.debug(f"RCC Status: {r.status}")
         return False
-    
-    def __rcc_update(self, vin="", hvac=22, seats="Off", defrost="Off"):
+
+    async def rcc_update(self, hvac=None, seats=None, defrost=None):
+        """
+        Queue a change to the RCC profile, changes made within a short window are sent as one profile update
+        Settings left as None keep the value last sent, or the default if they were never sent
+        """
+        intents = {name: value for name, value in (("hvac", hvac), ("seats", seats), ("defrost", defrost)) if value is not None}
+        return await self._queue.submit("rcc", intents, self.__send_rcc_profile)
+
+    async def __send_rcc_profile(self, intents):
+        profile = {**RCC_PROFILE_DEFAULTS, **self._rcc_profile, **intents}
+        result = await self._rcc_update(
+            None, profile.get("hvac"), profile.get("seats"), profile.get("defrost")
+        )
+        if result:
+            self._rcc_profile = profile
+        return result
+
+    async def _rcc_update(self, vin="", hvac=22, seats="Off", defrost="Off"):
         """ Remote control commands for AC, Heated / Ventilated Seats, Steering Wheel, Defroster, etc.
         hvac is in Celsius. Vehicle will need to be on and I'm not sure what will happen if it's off."""
         hvac_min = 16
         hvac_max = 30
         seats_mode = ["Heated2", "Cooled2", "Off"]
         defrost_mode = ["Off", "On"]
-        
-        if vin:
-            vin = vin
-        else:
+
+        if not vin:
             vin = self.vin
 
         if hvac:
@@ -811,203 +972,232 @@ class Vehicle:
                 return False
             defrost = f"{defrost}"
 
-        headers = {
-            **apiHeaders,
-            "Application-Id": self.region,
-            "authorization": f"Bearer {self.auto_token}"
-        }
+        await self.__acquire_token()
+        headers = self._autonomic_headers()
 
         data = {
             "crccStateFlag": "On",
             "userPreferences": [
                 {
-                "preferenceType": "RccHeatedWindshield_Rq",
-                "preferenceValue": f"{defrost}"
+                    "preferenceType": "RccHeatedWindshield_Rq",
+                    "preferenceValue": f"{defrost}"
                 },
                 {
-                "preferenceType": "RccRearDefrost_Rq",
-                "preferenceValue": f"{defrost}"
+                    "preferenceType": "RccRearDefrost_Rq",
+                    "preferenceValue": f"{defrost}"
                 },
                 {
-                "preferenceType": "RccHeatedSteeringWheel_Rq",
-                "preferenceValue": f"{defrost}"
+                    "preferenceType": "RccHeatedSteeringWheel_Rq",
+                    "preferenceValue": f"{defrost}"
                 },
                 {
-                "preferenceType": "RccLeftFrontClimateSeat_Rq",
-                "preferenceValue": f"{seats}"
+                    "preferenceType": "RccLeftFrontClimateSeat_Rq",
+                    "preferenceValue": f"{seats}"
                 },
                 {
-                "preferenceType": "RccLeftRearClimateSeat_Rq",
-                "preferenceValue": f"{seats}"
+                    "preferenceType": "RccLeftRearClimateSeat_Rq",
+                    "preferenceValue": f"{seats}"
                 },
                 {
-                "preferenceType": "RccRightFrontClimateSeat_Rq",
-                "preferenceValue": f"{seats}"
+                    "preferenceType": "RccRightFrontClimateSeat_Rq",
+                    "preferenceValue": f"{seats}"
                 },
                 {
-                "preferenceType": "RccRightRearClimateSeat_Rq",
-                "preferenceValue": f"{seats}"
+                    "preferenceType": "RccRightRearClimateSeat_Rq",
+                    "preferenceValue": f"{seats}"
                 },
                 {
-                "preferenceType": "SetPointTemp_Rq",
-                "preferenceValue": f"{hvac}"
+                    "preferenceType": "SetPointTemp_Rq",
+                    "preferenceValue": f"{hvac}"
                 }
             ],
             "vin": vin
-            }
-        
-        r = session.put(
+        }
+
+        r = await self._request(
+            "PUT",
             f"{GUARD_URL}/rcc/profile/update",
             headers=headers,
             data=json.dumps(data)
         )
 
-        if r.status_code == 200:
-            _LOGGER.debug(f"RCC Update: {r.status_code}")
-            response = r.json()
+        if r.status == 200:
+            _LOGGER.debug(f"RCC Update: {r.status}")
+            response = await r.json(content_type=None)
             _LOGGER.debug(response)
             return True
-        _LOGGER.debug(f"RCC Update: {r.status_code}")
+        _LOGGER.debug(f"RCC Update: {r.status}")
         return False
 
-    def zone_lighting_activation(self, vin="", power="On"):
+    async def zone_lighting_activation(self, vin="", power="On"):
         """
         Activate or deactivate zone lighting on the vehicle. I believe this is exclusive to the F-150 Lightning.
         """
-        if vin:
-            vin = vin
-        else:
+        if not vin:
             vin = self.vin
 
-        headers = {
-            **apiHeaders,
-            "Application-Id": self.region,
-            "authorization": f"Bearer {self.auto_token}"
-        }
+        await self.__acquire_token()
+        headers = self._autonomic_headers()
 
         data = {
             "vin": vin
         }
 
         if power == "On":
-            r = session.put(
-                f"https://api.mps.ford.com/vehicles/vpfi/zonelightingactivation",
-                headers=headers,
-                data=json.dumps(data)
-            )
+            method = "PUT"
+        elif power == "Off":
+            method = "DELETE"
+        else:
+            return None
+        r = await self._request(
+            method,
+            "https://api.mps.ford.com/vehicles/vpfi/zonelightingactivation",
+            headers=headers,
+            data=json.dumps(data)
+        )
+        if r.status == 200:
+            _LOGGER.debug(f"Zone Lighting Activation: {r.status}")
+            response = await r.json(content_type=None)
+            _LOGGER.debug(response)
+            return response
+        return None
 
-            if r.status_code == 200:
-                _LOGGER.debug(f"Zone Lighting Activation: {r.status_code}")
-                response = r.json()
-                _LOGGER.debug(response)
-                return response
-            
-        if power == "Off":
-            r = session.delete(
-                f"https://api.mps.ford.com/vehicles/vpfi/zonelightingactivation",
-                headers=headers,
-                data=json.dumps(data)
-            )   
-            if r.status_code == 200:
-                _LOGGER.debug(f"Zone Lighting Activation: {r.status_code}")
-                response = r.json()
-                _LOGGER.debug(response)
-                return response
-    
-    def zone_lighting_zone(self, vin="", zone=None, action=True):
+    async def zone_lighting(self, zone, action=True):
         """
-        Activate or deactivate a specific zone lighting on the vehicle. I believe this is exclusive to the F-150 Lightning.
+        Queue a zone lighting change, zones switched within a short window are sent together
+        and a change for "All" drops the zone changes queued before it
         """
-        if vin:
-            vin = vin
+        return await self._queue.submit("zones", {zone: action}, self.__send_zone_lighting, replace=zone == "All")
+
+    async def __send_zone_lighting(self, intents):
+        """
+        Send one zone lighting request for the queued intents, "All" when every zone ends up the same.
+        The API switches one zone or all of them per request, what is left goes out with the next flush
+        """
+        targets = {zone: (self._metrics.get(metric) or {}).get("value") == "On" for zone, metric in LIGHTING_ZONES.items()}
+        if "All" in intents:
+            targets.update(dict.fromkeys(LIGHTING_ZONES, intents["All"]))
+        targets.update({zone: action for zone, action in intents.items() if zone != "All"})
+        if len(set(targets.values())) == 1 and (len(intents) > 1 or "All" in intents):
+            zone, action, rest = "All", targets["Front"], {}
+        elif "All" in intents:
+            zone, action = "All", intents["All"]
+            rest = {name: value for name, value in intents.items() if name != "All"}
         else:
-            vin = self.vin
+            zone, action = next(iter(intents.items()))
+            rest = {name: value for name, value in intents.items() if name != zone}
+        result = await self.zone_lighting_zone(None, zone, action)
+        if result in (None, False):
+            return False
+        if rest:
+            return await self._queue.submit("zones", rest, self.__send_zone_lighting)
+        return True
 
-        headers = {
-            **apiHeaders,
-            "Application-Id": self.region,
-            "authorization": f"Bearer {self.auto_token}"
-        }
+    async def zone_lighting_zone(self, vin="", zone=None, action=True):
+        """
+        Activate or deactivate a specific zone lighting on the vehicle. I believe this is exclusive to the F-150 Lightning.
+        """
+        if not vin:
+            vin = self.vin
 
         zones = {"Front": 1, "Rear": 2, "Driver": 3, "Passenger": 4, "All": 0}
         if zone not in zones:
             _LOGGER.debug(f"Zone must be one of {zones}")
             return False
+
+        await self.__acquire_token()
+        headers = self._autonomic_headers()
         data = {
             "vin": vin,
         }
 
-        if action:
-            r = session.put(
-                f"https://api.mps.ford.com/vehicles/vpfi/{zone}/zonelightingzone",
-                headers=headers,
-                data=json.dumps(data)
-            )
-            if r.status_code == 200:
-                _LOGGER.debug(f"Zone Lighting Power Zone {zone}: {r.status_code}")
-                response = r.json()
-                _LOGGER.debug(response)
-                return response
-        if not action:
-            r = session.delete(
-                f"https://api.mps.ford.com/vehicles/vpfi/{zone}/zonelightingzone",
-                headers=headers,
-                data=json.dumps(data)
-            )
-            if r.status_code == 200:
-                _LOGGER.debug(f"Zone Lighting Power Zone {zone}: {r.status_code}")
-                response = r.json()
-                _LOGGER.debug(response)
-                return response
-
+        r = await self._request(
+            "PUT" if action else "DELETE",
+            f"https://api.mps.ford.com/vehicles/vpfi/{zone}/zonelightingzone",
+            headers=headers,
+            data=json.dumps(data)
+        )
+        if r.status == 200:
+            _LOGGER.debug(f"Zone Lighting Power Zone {zone}: {r.status}")
+            response = await r.json(content_type=None)
+            _LOGGER.debug(response)
+            return response
+        return None
 
-    def __electrification_command(self, command):
-        """Send command to the new Electrification Command endpoint"""
-        self.__acquire_token()
-        headers = {
-            **apiHeaders,
-            "Application-Id": self.region,
-            "authorization": f"Bearer {self.auto_token}"
-        }
+    async def __electrification_command(self, command, intent):
+        """Send command to the new Electrification Command endpoint, intent names it in COMMAND_TARGETS"""
+        reason = self.preclusion()
+        if reason is not None:
+            # The kept telemetry may be old, only refuse when live data agrees
+            reason = await self.__commandable(True)
+        if reason is not None:
+            _LOGGER.warning("%s was not sent to %s: %s", intent, self.vin, reason)
+            return False
+        self.__commanded(intent)
+        await self.__acquire_token()
+        headers = self._autonomic_headers()
 
-        r = session.post(
+        r = await self._request(
+            "POST",
             f"{GUARD_URL}/electrification/experiences/v1/vehicles/{self.vin}/global-charge-command/{command}",
             headers=headers
-            )
+        )
 
         _LOGGER.debug("EV Charge command")
-        _LOGGER.debug(r.status_code)
-        _LOGGER.debug(r.text)
-        if r.status_code == 202:
-            _LOGGER.debug(f"EV Charge command Status: {r.status_code}")
-            response = r.json()
+        _LOGGER.debug(r.status)
+        _LOGGER.debug(await r.text())
+        if r.status == 202:
+            _LOGGER.debug(f"EV Charge command Status: {r.status}")
+            response = await r.json(content_type=None)
             correlationId = response["correlationId"]
             if correlationId is not None:
                 _LOGGER.debug(f"EV Charge command Correlation ID: {correlationId}")
                 return True
             _LOGGER.debug(f"EV Charge command Correlation ID: {correlationId}")
             return False
-        _LOGGER.debug(f"EV Charge command Status code not 202: {r.status_code}")
+        _LOGGER.debug(f"EV Charge command Status code not 202: {r.status}")
         return False
 
-    def __electrification_transfer_status(self):
+    async def energy_transfer_status(self):
         """Energy Transfer Status"""
-        self.__acquire_token()
-        headers = {
-            **apiHeaders,
-            "Application-Id": self.region,
-            "authorization": f"Bearer {self.auto_token}"
-        }
-        r = session.get(
+        await self.__acquire_token()
+        headers = self._autonomic_headers()
+        r = await self._request(
+            "GET",
             f"{GUARD_URL}/electrification/experiences/v1/vehicles/{self.vin}/energy-transfer-status",
             headers=headers
         )
         _LOGGER.debug("EV Transfer Status")
-        _LOGGER.debug(r.status_code)
-        _LOGGER.debug(r.text)
-        if r.status_code == 200:
-            _LOGGER.debug(f"EV Transfer Status: {r.status_code}")
-            response = r.json()
+        _LOGGER.debug(r.status)
+        _LOGGER.debug(await r.text())
+        if r.status == 200:
+            _LOGGER.debug(f"EV Transfer Status: {r.status}")
+            response = await r.json(content_type=None)
             return response
         return False
 
+
+class Vehicle:
+    """Blocking wrapper around AsyncVehicle for scripts that run outside Home Assistant"""
+
+    def __init__(
+        self, username, password, vin, region, save_token=False, config_location=""
+    ):
+        self._loop = asyncio.new_event_loop()
+        self.vehicle = AsyncVehicle(username, password, vin, region, save_token, config_location)
+
+    def __getattr__(self, name):
+        if name in ("_loop", "vehicle"):
+            raise AttributeError(name)
+        attr = getattr(self.vehicle, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        def run(*args, **kwargs):
+            return self._loop.run_until_complete(attr(*args, **kwargs))
+        return run
+
+    def close(self):
+        """Close the HTTP session and the private event loop"""
+        self._loop.run_until_complete(self.vehicle.close())
+        self._loop.close()
@@ -4,7 +4,8 @@ import logging
 from homeassistant.components.lock import LockEntity
 
 from . import FordPassEntity
-from .const import DOMAIN, COORDINATOR
+from .const import DOMAIN, COORDINATOR, LOCK_DEPENDENCIES
+from .ratelimit import PRIORITY_COMMAND, request_priority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,7 +15,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     entry = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
 
     lock = Lock(entry)
-    if lock.coordinator.data["metrics"]["doorLockStatus"] and lock.coordinator.data["metrics"]["doorLockStatus"][0]["value"] != "ERROR":
+    if entry.reports("metrics.doorLockStatus") and entry.telemetry.door_lock != "ERROR":
         async_add_entities([lock], False)
     else:
         _LOGGER.debug("Ford model doesn't support remote locking")
@@ -26,44 +27,42 @@ class Lock(FordPassEntity, LockEntity):
         """Initialize."""
         self._device_id = "fordpass_doorlock"
         self.coordinator = coordinator
-        self.data = coordinator.data["metrics"]
+        self.dependencies = LOCK_DEPENDENCIES
 
         # Required for HA 2022.7
         self.coordinator_context = object()
 
     async def async_lock(self, **kwargs):
-        """Locks the vehicle."""
-        self._attr_is_locking = True
-        self.async_write_ha_state()
+        """Locks the vehicle, showing it as locking until the command finishes."""
         _LOGGER.debug("Locking %s", self.coordinator.vin)
-        status = await self.coordinator.hass.async_add_executor_job(
-            self.coordinator.vehicle.lock
-        )
-        _LOGGER.debug(status)
-        await self.coordinator.async_request_refresh()
-        _LOGGER.debug("Locking here")
-        self._attr_is_locking = False
-        self.async_write_ha_state()
+        with request_priority(PRIORITY_COMMAND):
+            self.async_run_command(True, self.coordinator.vehicle.lock())
 
     async def async_unlock(self, **kwargs):
-        """Unlocks the vehicle."""
+        """Unlocks the vehicle, showing it as unlocking until the command finishes."""
         _LOGGER.debug("Unlocking %s", self.coordinator.vin)
-        self._attr_is_unlocking = True
-        self.async_write_ha_state()
-        status = await self.coordinator.hass.async_add_executor_job(
-            self.coordinator.vehicle.unlock
-        )
-        _LOGGER.debug(status)
-        await self.coordinator.async_request_refresh()
-        self._attr_is_unlocking = False
-        self.async_write_ha_state()
+        with request_priority(PRIORITY_COMMAND):
+            self.async_run_command(False, self.coordinator.vehicle.unlock())
+
+    @property
+    def is_locking(self):
+        """Return True while a lock command is pending."""
+        return self._optimistic is True
+
+    @property
+    def is_unlocking(self):
+        """Return True while an unlock command is pending."""
+        return self._optimistic is False
 
     @property
     def is_locked(self):
         """Determine if the lock is locked."""
-        if self.coordinator.data["metrics"] is None or self.coordinator.data["metrics"]["doorLockStatus"] is None:
+        if self._optimistic is not None:
+            return self._optimistic
+        door_lock = self.coordinator.telemetry.door_lock
+        if door_lock is None:
             return None
-        return self.coordinator.data["metrics"]["doorLockStatus"][0]["value"] == "LOCKED"
+        return door_lock == "LOCKED"
 
     @property
     def icon(self):
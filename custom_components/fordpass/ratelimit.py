@@ -0,0 +1,211 @@
+"""Client-side request budget and token-bucket rate limits for a FordPass account"""
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+_LOGGER = logging.getLogger(__name__)
+
+# Who a request is made for, user actions outrank manual refreshes which outrank coordinator polls.
+# The first refresh of a vehicle is never held back for others, it only waits for tokens
+PRIORITY_COMMAND = "command"
+PRIORITY_SETUP = "setup"
+PRIORITY_SERVICE = "service"
+PRIORITY_POLL = "poll"
+
+# Share of the daily budget that must be left for a priority to go through, the rest is kept for higher priorities
+SHED_RESERVE = {PRIORITY_COMMAND: 0, PRIORITY_SETUP: 0, PRIORITY_SERVICE: 0.05, PRIORITY_POLL: 0.1}
+
+# Tokens left in a bucket for higher priorities, and the longest a request waits for one before it is shed.
+# Waits stay below the endpoint fetch timeouts so a request is shed rather than timed out
+BURST_RESERVE = {PRIORITY_COMMAND: 0, PRIORITY_SETUP: 0, PRIORITY_SERVICE: 1, PRIORITY_POLL: 2}
+MAX_WAIT = {PRIORITY_COMMAND: 30, PRIORITY_SETUP: 15, PRIORITY_SERVICE: 15, PRIORITY_POLL: 5}
+
+BUDGET_WINDOW = 86400
+
+# Requests per minute and burst for the whole account. The burst covers a login and the account-wide
+# messages and vehicles calls, and grows by one refresh tick (status plus three endpoints and a retry) per vehicle
+ACCOUNT_RATE = 20
+ACCOUNT_BURST = 15
+VEHICLE_BURST = 5
+
+# Requests per minute, burst and extra burst per vehicle for each endpoint, matched in order against
+# "<host><path>", the rest use the default. A full login is about 6 auth requests in a row,
+# the auth burst lets one through at any priority
+ENDPOINT_LIMITS = (
+    ("auth", re.compile(r"^(sso\.ci\.ford\.com|login\.ford\.com|accounts\.autonomic\.ai)/|/token/"), 6, 10, 0),
+    ("telemetry", re.compile(r"/telemetry/"), 12, 6, 1),
+    ("commands", re.compile(r"/command/|/guardmode/|/rcc/profile/update|zonelighting|/global-charge-command/"), 6, 3, 0),
+)
+ENDPOINT_DEFAULT = ("other", 10, 10, 3)
+
+_PRIORITY = contextvars.ContextVar("fordpass_priority", default=PRIORITY_POLL)
+
+
+@contextmanager
+def request_priority(priority):
+    """Make the requests sent within the block, and the tasks started from it, count as priority"""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+class RateLimited(Exception):
+    """A request was shed to stay within the budget or rate limits"""
+
+
+def endpoint_of(url):
+    """Return the rate limit group of a URL"""
+    parsed = urlparse(url)
+    target = f"{parsed.hostname}{parsed.path}"
+    for name, pattern, _, _, _ in ENDPOINT_LIMITS:
+        if pattern.search(target):
+            return name
+    return ENDPOINT_DEFAULT[0]
+
+
+class TokenBucket:
+    """Refills rate tokens per minute up to capacity, each request takes one"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate / 60
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now, reserve=0):
+        """Return the seconds until a token above reserve is free"""
+        self._refill(now)
+        return max(0, (1 + reserve - self.tokens) / self.rate)
+
+    def take(self, now):
+        """Use a token"""
+        self._refill(now)
+        self.tokens -= 1
+
+    def resize(self, capacity):
+        """Change the burst, a larger one is available straight away"""
+        self.tokens = min(capacity, self.tokens + max(0, capacity - self.capacity))
+        self.capacity = capacity
+
+
+class RateLimiter:
+    """Token buckets per account and endpoint plus a rolling daily budget shared by the vehicles of an account"""
+
+    def __init__(self, account_rate=ACCOUNT_RATE, account_burst=ACCOUNT_BURST):
+        # Daily budget contributed by each vehicle on the account
+        self.budgets = {}
+        self.vehicles = set()
+        self.shed = dict.fromkeys(SHED_RESERVE, 0)
+        self.account_burst = account_burst
+        self._account = TokenBucket(account_rate, account_burst)
+        self._endpoints = {}
+        self._requests = deque()
+
+    def add_vehicle(self, vin, daily_budget=None):
+        """Count a vehicle on the account, growing the bursts by its refresh and adding its daily budget"""
+        self.vehicles.add(vin)
+        if daily_budget is not None:
+            self.budgets[vin] = daily_budget
+        self._resize()
+
+    def remove_vehicle(self, vin):
+        """Stop counting a vehicle on the account"""
+        self.vehicles.discard(vin)
+        self.budgets.pop(vin, None)
+        self._resize()
+
+    def _resize(self):
+        count = len(self.vehicles)
+        self._account.resize(self.account_burst + VEHICLE_BURST * count)
+        for endpoint, bucket in self._endpoints.items():
+            _, burst, vehicle_burst = self._limits(endpoint)
+            bucket.resize(burst + vehicle_burst * count)
+
+    @property
+    def daily_budget(self):
+        """Return the requests allowed per rolling day, None when no vehicle has set a budget"""
+        return sum(self.budgets.values()) if self.budgets else None
+
+    def used(self, now=None):
+        """Return the number of requests made within the budget window"""
+        now = time.monotonic() if now is None else now
+        while self._requests and now - self._requests[0] >= BUDGET_WINDOW:
+            self._requests.popleft()
+        return len(self._requests)
+
+    def remaining(self, now=None):
+        """Return the requests left in the budget window, None when there is no budget"""
+        budget = self.daily_budget
+        if budget is None:
+            return None
+        return max(0, budget - self.used(now))
+
+    def next_free(self, now=None):
+        """Return the seconds until the oldest request in the window stops counting against the budget"""
+        now = time.monotonic() if now is None else now
+        if not self._requests:
+            return 0
+        return max(0, self._requests[0] + BUDGET_WINDOW - now)
+
+    @staticmethod
+    def _limits(endpoint):
+        """Return the rate, burst and extra burst per vehicle of an endpoint"""
+        for name, _, rate, burst, vehicle_burst in ENDPOINT_LIMITS:
+            if name == endpoint:
+                return rate, burst, vehicle_burst
+        return ENDPOINT_DEFAULT[1:]
+
+    def _bucket(self, endpoint):
+        bucket = self._endpoints.get(endpoint)
+        if bucket is None:
+            rate, burst, vehicle_burst = self._limits(endpoint)
+            bucket = self._endpoints[endpoint] = TokenBucket(rate, burst + vehicle_burst * len(self.vehicles))
+        return bucket
+
+    def _shed(self, priority, reason):
+        self.shed[priority] += 1
+        _LOGGER.debug("Shedding %s request: %s", priority, reason)
+        raise RateLimited(reason)
+
+    async def acquire(self, url):
+        """Wait until a request to url may be sent at the current priority, raising RateLimited if it is shed"""
+        priority = _PRIORITY.get()
+        endpoint = endpoint_of(url)
+        remaining = self.remaining()
+        if remaining is not None and remaining <= self.daily_budget * SHED_RESERVE[priority]:
+            self._shed(priority, f"{remaining} of {self.daily_budget} daily requests left")
+        buckets = (self._account, self._bucket(endpoint))
+        reserve = BURST_RESERVE[priority]
+        waited = 0
+        while True:
+            now = time.monotonic()
+            # A bucket never holds back its whole burst, small ones would otherwise shut lower priorities out
+            delay = max(bucket.delay(now, min(reserve, bucket.capacity - 1)) for bucket in buckets)
+            if delay == 0:
+                break
+            if waited + delay > MAX_WAIT[priority]:
+                self._shed(priority, f"{endpoint} rate limit reached")
+            await asyncio.sleep(delay)
+            waited += delay
+        for bucket in buckets:
+            bucket.take(now)
+        self._requests.append(now)
+
+    def stats(self):
+        """Return budget use and shed counts"""
+        return {
+            "daily_budget": self.daily_budget,
+            "used": self.used(),
+            "shed": dict(self.shed),
+        }
@@ -0,0 +1,106 @@
+"""Refresh cadence tracking for the FordPass API endpoints"""
+from .ratelimit import BUDGET_WINDOW
+
+# Ticks rarely line up exactly with an endpoint interval, allow a little early refresh
+DUE_SLACK = 30
+
+# Once less than the reserve share of the daily request budget is left, the vehicle's share
+# of the remaining requests is spread evenly over the budget window instead of spent at the preferred rate
+BUDGET_RESERVE = 0.2
+
+IGNITION_ON = ("On", "START", "RUN")
+
+
+class EndpointSchedule:
+    """Tracks when an endpoint was last fetched and how long its payload stays valid"""
+
+    def __init__(self, name, interval, ttl=None):
+        self.name = name
+        self.interval = interval
+        self.ttl = ttl
+        self.payload = None
+        self.fetched_at = None
+
+    def is_due(self, now):
+        """Return True when the endpoint should be fetched on this tick"""
+        if self.fetched_at is None:
+            return True
+        return now - self.fetched_at >= self.interval - DUE_SLACK
+
+    def update(self, payload, now):
+        """Store a freshly fetched payload"""
+        self.payload = payload
+        self.fetched_at = now
+
+    def restore(self, payload, now):
+        """Seed a payload from a saved snapshot, due for a refresh straight away"""
+        self.payload = payload
+        self.fetched_at = now - self.interval
+
+    def current(self, now):
+        """Return the stored payload, or None once it is older than its TTL"""
+        if self.fetched_at is None:
+            return None
+        if self.ttl is not None and now - self.fetched_at > self.ttl:
+            return None
+        return self.payload
+
+
+class AdaptivePoller:
+    """
+    Picks the next telemetry interval from the vehicle state within interval bounds
+    and the account's request budget, as counted by its rate limiter
+    """
+
+    def __init__(self, parked_interval, min_interval, max_interval, limiter, vin, state_intervals):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.parked_interval = parked_interval
+        self.limiter = limiter
+        self.vin = vin
+        self.state_intervals = state_intervals
+        self.state = None
+
+    @staticmethod
+    def vehicle_state(data):
+        """Classify the vehicle from a status payload"""
+        metrics = (data or {}).get("metrics", {})
+        states = (data or {}).get("states", {})
+        speed = metrics.get("speed", {}).get("value") or 0
+        if speed > 0:
+            return "driving"
+        if (metrics.get("remoteStartCountdownTimer", {}).get("value") or 0) > 0:
+            return "remote_start"
+        if metrics.get("ignitionStatus", {}).get("value") in IGNITION_ON:
+            return "running"
+        plug_status = str(metrics.get("xevPlugChargerStatus", {}).get("value", ""))
+        charge_status = str(metrics.get("xevBatteryChargeDisplayStatus", {}).get("value", ""))
+        if plug_status.upper() == "CHARGING" or charge_status.upper() == "IN_PROGRESS":
+            return "charging"
+        preclusion = states.get("commandPreclusion", {}).get("value") or {}
+        if preclusion.get("toState") == "COMMANDS_PRECLUDED":
+            return "deep_sleep"
+        return "parked"
+
+    def next_interval(self, data, now):
+        """Return the number of seconds until the next telemetry refresh"""
+        self.state = self.vehicle_state(data)
+        if self.state == "deep_sleep":
+            interval = self.max_interval
+        elif self.state == "parked":
+            interval = self.parked_interval
+        else:
+            interval = self.state_intervals[self.state]
+        interval = min(max(interval, self.min_interval), self.max_interval)
+
+        # The budget wins over the max bound, it is the limit that protects the account
+        budget = self.limiter.daily_budget
+        remaining = self.limiter.remaining(now)
+        if not budget or remaining is None:
+            return interval
+        if remaining <= 0:
+            interval = max(interval, self.limiter.next_free(now))
+        elif remaining < budget * BUDGET_RESERVE:
+            share = self.limiter.budgets.get(self.vin, budget) / budget
+            interval = max(interval, BUDGET_WINDOW / (remaining * share))
+        return interval
@@ -0,0 +1,42 @@
+"""Sharing of identical in-flight FordPass API calls and their fresh results"""
+import asyncio
+import time
+
+
+class SingleFlight:
+    """Runs one call per key at a time for every caller asking for it, and reuses its result while it is fresh"""
+
+    def __init__(self):
+        self._cache = {}
+        self._inflight = {}
+
+    def fresh(self, key, max_age):
+        """Return the result of the last call for key if it is younger than max_age, otherwise None"""
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        return None
+
+    def pending(self, key):
+        """Return the task of the call for key that is in flight, or None"""
+        return self._inflight.get(key)
+
+    async def run(self, key, func, max_age=0):
+        """Return a fresh result for key, joining the call in flight or starting func() if there is none"""
+        result = self.fresh(key, max_age)
+        if result is not None:
+            return result
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled caller doesn't cancel the call for everyone else
+        result = await asyncio.shield(task)
+        if result is not None:
+            self._cache[key] = (time.monotonic(), result)
+        return result
+
+    def clear(self):
+        """Forget cached results, calls in flight still finish"""
+        self._cache.clear()
@@ -6,7 +6,8 @@ from homeassistant.const import STATE_ON, STATE_OFF
 from homeassistant.helpers.icon import icon_for_battery_level
 
 from . import FordPassEntity
-from .const import DOMAIN, SWITCHES, COORDINATOR
+from .const import DOMAIN, SWITCHES, SWITCH_DEPENDENCIES, COORDINATOR
+from .ratelimit import PRIORITY_COMMAND, request_priority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +58,9 @@ SWITCHES = {
     }
 }
 
+# Zone lighting switches and the zone their commands address, left and right are the driver and passenger zones
+ZONE_COMMANDS = {"zone_front": "Front", "zone_rear": "Rear", "zone_left": "Driver", "zone_right": "Passenger"}
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Add the Switch from the config."""
@@ -130,6 +134,7 @@ class Switch(FordPassEntity, SwitchEntity):
             coordinator=coordinator
         )
         self.switch = switch
+        self.dependencies = SWITCH_DEPENDENCIES.get(switch)
         self._attr_unique_id = f"{entry_id}_{switch}"
         self._entry_id = entry_id
         _LOGGER.debug("Initializing switch %s", self.name)
@@ -145,134 +150,102 @@ class Switch(FordPassEntity, SwitchEntity):
         return SWITCHES[self.switch]["icon"]
 
     async def async_turn_on(self, **kwargs):
-        """Turn on the switch."""
+        """Turn on the switch, showing it on until the command finishes."""
         _LOGGER.debug("Turning on %s", self.switch)
+        vehicle = self.coordinator.vehicle
         if self.switch == "ignition":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.start
-            )
-            await self.coordinator.async_request_refresh()
+            command = vehicle.start()
         elif self.switch == "guardmode":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.enableGuard
-            )
-            await self.coordinator.async_request_refresh()
+            command = vehicle.enable_guard()
         elif self.switch == "charging":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.ev_start_charge
-            )
+            command = vehicle.ev_start_charge()
         elif self.switch == "zone_lighting":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.zone_lighting_activation, None, "On"
-            )
-        elif self.switch.startswith("zone_"):
-            zone = self.switch.replace("zone_", "").capitalize()
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.zone_lighting_zone, None, zone, True
-            )
+            command = vehicle.zone_lighting_activation(None, "On")
+        elif self.switch in ZONE_COMMANDS:
+            command = vehicle.zone_lighting(ZONE_COMMANDS[self.switch], True)
         elif self.switch == "defrost":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle._rcc_update, None, None, None, "On"
-            )
+            command = vehicle.rcc_update(defrost="On")
         elif self.switch == "heated_seats":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle._rcc_update, None, None, "Heated2", None
-            )
+            command = vehicle.rcc_update(seats="Heated2")
         elif self.switch == "cooled_seats":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle._rcc_update, None, None, "Cooled2", None
-            )
-        await self.coordinator.async_request_refresh()
-        self.async_write_ha_state()
+            command = vehicle.rcc_update(seats="Cooled2")
+        else:
+            return
+        with request_priority(PRIORITY_COMMAND):
+            self.async_run_command(True, self._succeeded(command))
 
     async def async_turn_off(self, **kwargs):
-        """Turn off the switch."""
+        """Turn off the switch, showing it off until the command finishes."""
         _LOGGER.debug("Turning off %s", self.switch)
+        vehicle = self.coordinator.vehicle
         if self.switch == "ignition":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.stop
-            )
-            await self.coordinator.async_request_refresh()
+            command = vehicle.stop()
         elif self.switch == "guardmode":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.disableGuard
-            )
-            await self.coordinator.async_request_refresh()
+            command = vehicle.disable_guard()
         elif self.switch == "charging":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.ev_stop_charge
-            )
+            command = vehicle.ev_stop_charge()
         elif self.switch == "zone_lighting":
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.zone_lighting_activation, None, "Off"
-            )
-        elif self.switch.startswith("zone_"):
-            zone = self.switch.replace("zone_", "").capitalize()
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle.zone_lighting_zone, None, zone, False
-            )
-        elif self.switch in ["defrost", "heated_seats", "cooled_seats"]:
-            await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.vehicle._rcc_update, None, None, "Off", "Off"
-            )
-        await self.coordinator.async_request_refresh()
-        self.async_write_ha_state()
+            command = vehicle.zone_lighting_activation(None, "Off")
+        elif self.switch in ZONE_COMMANDS:
+            command = vehicle.zone_lighting(ZONE_COMMANDS[self.switch], False)
+        elif self.switch == "defrost":
+            command = vehicle.rcc_update(defrost="Off")
+        elif self.switch in ["heated_seats", "cooled_seats"]:
+            command = vehicle.rcc_update(seats="Off")
+        else:
+            return
+        with request_priority(PRIORITY_COMMAND):
+            self.async_run_command(False, self._succeeded(command))
+
+    @staticmethod
+    async def _succeeded(command):
+        """Await a vehicle command and tell whether it went through, the guard calls return the HTTP response"""
+        result = await command
+        if hasattr(result, "status"):
+            return result.status < 300
+        return result not in (None, False)
 
     @property
     def is_on(self):
-        """Return true if switch is on."""
+        """Return true if switch is on, computed once per coordinator refresh."""
+        if self._optimistic is not None:
+            return self._optimistic
+        return self.cached(self._compute_is_on)
+
+    def _compute_is_on(self):
         if self.coordinator.data is None:
             _LOGGER.debug("%s: No coordinator data", self.switch)
             return None
 
+        telemetry = self.coordinator.telemetry
         if self.switch == "ignition":
-            _LOGGER.debug("Checking ignition state")
-            if "metrics" not in self.coordinator.data:
-                _LOGGER.debug("Ignition: No metrics data")
-                return None
-            
-            metrics = self.coordinator.data.get("metrics", {})
-            _LOGGER.debug("Metrics data for ignition: %s", metrics)
-            
             # Try different possible paths for ignition status
-            ignition_status = None
-            if "ignitionStatus" in metrics:
-                ignition_status = metrics["ignitionStatus"].get("value")
-            elif "engineStatus" in metrics:
-                ignition_status = metrics["engineStatus"].get("value")
-            
+            ignition_status = telemetry.value("ignitionStatus")
+            if not telemetry.has("ignitionStatus"):
+                ignition_status = telemetry.value("engineStatus")
             _LOGGER.debug("Ignition status found: %s", ignition_status)
             return ignition_status in ["On", "START", "RUN"]
             
         elif self.switch == "charging":
-            if (
-                "metrics" not in self.coordinator.data 
-                or "xevPlugChargerStatus" not in self.coordinator.data["metrics"]
-            ):
+            if not telemetry.has("xevPlugChargerStatus"):
                 _LOGGER.debug("Charging: No charging metrics data")
                 return None
-            charging_status = self.coordinator.data["metrics"]["xevPlugChargerStatus"]["value"]
+            charging_status = telemetry.value("xevPlugChargerStatus")
             _LOGGER.debug("Charging status: %s", charging_status)
             return charging_status == "Charging"
             
         elif self.switch == "guardmode":
-            if "guardstatus" not in self.coordinator.data:
+            if not self.coordinator.data.get("guardstatus"):
                 return None
             return self.coordinator.data["guardstatus"].get("value") == "Active"
             
         elif self.switch == "zone_lighting":
-            if (
-                "metrics" not in self.coordinator.data 
-                or "zoneLighting" not in self.coordinator.data["metrics"]
-            ):
+            if not telemetry.has("zoneLighting"):
                 return None
-            return self.coordinator.data["metrics"]["zoneLighting"]["value"] == "On"
+            return telemetry.value("zoneLighting") == "On"
             
         elif self.switch.startswith("zone_"):
-            if (
-                "metrics" not in self.coordinator.data 
-                or "zoneLighting" not in self.coordinator.data["metrics"]
-            ):
+            if not telemetry.has("zoneLighting"):
                 return None
             # Map switch names to zone names in the API
             zone_map = {
@@ -284,19 +257,17 @@ class Switch(FordPassEntity, SwitchEntity):
             zone = zone_map.get(self.switch)
             if not zone:
                 return None
-            return self.coordinator.data["metrics"].get(f"zoneLighting{zone}", {}).get("value") == "On"
+            return telemetry.value(f"zoneLighting{zone}") == "On"
             
         elif self.switch in ["defrost", "heated_seats", "cooled_seats"]:
-            capabilities = self.coordinator.data.get("vehicleCapabilities", [{}])[0]
+            remote_climate = self.coordinator.capability("remoteClimateControl") == "Display"
             
             if self.switch == "defrost":
-                return capabilities.get("remoteClimateControl") == "Display"
+                return remote_climate
             elif self.switch == "heated_seats":
-                return capabilities.get("remoteClimateControl") == "Display"
+                return remote_climate
             elif self.switch == "cooled_seats":
                 # Check if vehicle has ventilated seats capability
-                vehicle_profile = self.coordinator.data.get("vehicleProfile", [{}])[0]
-                return (capabilities.get("remoteClimateControl") == "Display" and 
-                       vehicle_profile.get("driverHeatedSeat") == "Heat with Vent")
+                return remote_climate and self.coordinator.profile("driverHeatedSeat") == "Heat with Vent"
             
         return False
@@ -0,0 +1,138 @@
+"""Typed view of the FordPass telemetry payload, decoded once per poll"""
+import logging
+
+from .changes import SECTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Metrics whose sensors show the whole entry as attributes, the others keep only their value and update time
+ATTRIBUTE_METRICS = frozenset(("odometer", "oilLifeRemaining", "alarmStatus", "ignitionStatus"))
+
+
+class Metric:
+    """A single telemetry metric, raw keeps the original entry only when it is shown as attributes"""
+
+    __slots__ = ("value", "update_time", "raw")
+
+    def __init__(self, raw, keep_raw=False):
+        self.raw = raw if keep_raw else None
+        self.value = raw.get("value")
+        self.update_time = raw.get("updateTime")
+
+
+def _location_name(entry, key):
+    """Doors and windows on the front row are reported as UNSPECIFIED_FRONT with the side alongside"""
+    if entry.get(key) == "UNSPECIFIED_FRONT" and "vehicleSide" in entry:
+        return entry["vehicleSide"]
+    return entry.get(key)
+
+
+def _index(name, entries, decode):
+    """Decode a list of located entries into a dict, skipping malformed ones instead of failing the whole payload"""
+    indexed = {}
+    if not isinstance(entries, list):
+        return indexed
+    for entry in entries:
+        try:
+            key, value = decode(entry)
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Skipping malformed %s entry %s: %s", name, entry, err)
+            continue
+        indexed[key] = value
+    return indexed
+
+
+def _first_value(entries, default=None):
+    """Return the value of the first entry of a single entry list"""
+    if isinstance(entries, list) and entries and isinstance(entries[0], dict):
+        return entries[0].get("value", default)
+    return default
+
+
+class Telemetry:
+    """
+    Metrics indexed by name with the door, window and tire lists indexed by location.
+    Only decoded values are kept, the payload itself stays with the coordinator
+    """
+
+    __slots__ = (
+        "update_time",
+        "names",
+        "metrics",
+        "indicators",
+        "custom_metrics",
+        "states",
+        "doors",
+        "windows",
+        "tires",
+        "tire_system_status",
+        "door_lock",
+    )
+
+    def __init__(self, payload):
+        self.update_time = payload.get("updateTime")
+        raw_metrics = payload.get("metrics") or {}
+        self.names = frozenset(raw_metrics)
+        self.metrics = {}
+        for name, entry in raw_metrics.items():
+            if isinstance(entry, dict) and ("value" in entry or "updateTime" in entry):
+                self.metrics[name] = Metric(entry, name in ATTRIBUTE_METRICS)
+        self.indicators = {name: Metric(entry) for name, entry in (raw_metrics.get("indicators") or {}).items() if isinstance(entry, dict)}
+        self.custom_metrics = {name: Metric(entry) for name, entry in (raw_metrics.get("customMetrics") or {}).items() if isinstance(entry, dict)}
+        self.states = {name: Metric(entry) for name, entry in (payload.get("states") or {}).items() if isinstance(entry, dict)}
+
+        self.doors = _index("doorStatus", raw_metrics.get("doorStatus"), lambda door: (_location_name(door, "vehicleDoor"), door.get("value")))
+        self.windows = _index("windowStatus", raw_metrics.get("windowStatus"), lambda window: (_location_name(window, "vehicleWindow"), window))
+        self.tires = _index("tirePressure", raw_metrics.get("tirePressure"), lambda tire: (tire["vehicleWheel"], float(tire["value"])))
+        self.tire_system_status = _first_value(raw_metrics.get("tirePressureSystemStatus"), "Unsupported")
+        self.door_lock = _first_value(raw_metrics.get("doorLockStatus"))
+
+    def has(self, name):
+        """Return True if the vehicle reports the metric"""
+        return name in self.names
+
+    def metric(self, name):
+        """Return a metric, or None if the vehicle doesn't report it"""
+        return self.metrics.get(name)
+
+    def value(self, name, default=None):
+        """Return the value of a metric, or default if the vehicle doesn't report it"""
+        metric = self.metrics.get(name)
+        if metric is None:
+            return default
+        return metric.value
+
+    def raw(self, name):
+        """Return the original metric entry for the ATTRIBUTE_METRICS, or an empty dict"""
+        metric = self.metrics.get(name)
+        return metric.raw if metric is not None and metric.raw is not None else {}
+
+    def state(self, name):
+        """Return the value of a vehicle state, or None"""
+        state = self.states.get(name)
+        return state.value if state is not None else None
+
+
+def telemetry_keys(payload):
+    """Return every "<section>.<name>" key present in a payload"""
+    return {f"{section}.{name}" for section in SECTIONS for name in (payload.get(section) or {})}
+
+
+def query_body(keys):
+    """Build the telemetry :query body asking for the given "<section>.<name>" keys only"""
+    body = {section: [] for section in SECTIONS}
+    for key in sorted(keys):
+        section, _, name = key.partition(".")
+        if section in body:
+            body[section].append(name)
+    return body
+
+
+def project(payload, keys):
+    """Return the payload with only the given keys left in its sections, for when the server ignores the query"""
+    projected = dict(payload)
+    for section in SECTIONS:
+        entries = payload.get(section)
+        if isinstance(entries, dict):
+            projected[section] = {name: entry for name, entry in entries.items() if f"{section}.{name}" in keys}
+    return projected
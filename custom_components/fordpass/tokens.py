@@ -0,0 +1,211 @@
+"""In-memory token state for the FordPass and Autonomic APIs"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+
+from .executor import get_executor
+
+_LOGGER = logging.getLogger(__name__)
+
+# Refresh a little before the real expiry so requests in flight don't race it
+EXPIRY_MARGIN = 60
+
+# Seconds to wait for further token changes before writing them to disk
+SAVE_DELAY = 1
+
+# Full logins allowed within the window, so repeated 401s can't turn into a login storm
+LOGIN_LIMIT = 3
+LOGIN_WINDOW = 3600
+
+
+class LoginThrottled(Exception):
+    """Too many full logins were needed in a short time, the account is left alone for a while"""
+
+
+class TokenManager:
+    """Holds the FordPass and Autonomic tokens and runs a single refresh for all waiting callers"""
+
+    def __init__(self):
+        self.token = None
+        self.refresh_token = None
+        self.expires_at = None
+        self.auto_token = None
+        self.auto_refresh_token = None
+        self.auto_expires_at = None
+        self.loaded = False
+        self._refresh_task = None
+        self._logins = deque()
+
+    def clear(self):
+        """Forget all tokens"""
+        self.token = None
+        self.refresh_token = None
+        self.expires_at = None
+        self.auto_token = None
+        self.auto_refresh_token = None
+        self.auto_expires_at = None
+        self.loaded = False
+
+    def record_login(self, now=None):
+        """Count a full login, raising LoginThrottled once the limit for the window is used up"""
+        now = time.monotonic() if now is None else now
+        while self._logins and now - self._logins[0] >= LOGIN_WINDOW:
+            self._logins.popleft()
+        if len(self._logins) >= LOGIN_LIMIT:
+            raise LoginThrottled(
+                f"{len(self._logins)} logins in the last {LOGIN_WINDOW} seconds, next allowed in {self._logins[0] + LOGIN_WINDOW - now:.0f}"
+            )
+        self._logins.append(now)
+
+    def ford_valid(self):
+        """Return True if the FordPass token can be used as is"""
+        return self.token is not None and self.expires_at is not None and time.time() < self.expires_at - EXPIRY_MARGIN
+
+    def auto_valid(self):
+        """Return True if the Autonomic token can be used as is"""
+        return self.auto_token is not None and self.auto_expires_at is not None and time.time() < self.auto_expires_at - EXPIRY_MARGIN
+
+    def is_valid(self):
+        """Return True if no refresh is needed"""
+        return self.ford_valid() and self.auto_valid()
+
+    def set_ford(self, result):
+        """Store a FordPass token response"""
+        self.token = result["access_token"]
+        self.refresh_token = result["refresh_token"]
+        self.expires_at = time.time() + result["expires_in"]
+
+    def set_auto(self, result):
+        """Store an Autonomic token response"""
+        self.auto_token = result["access_token"]
+        self.auto_refresh_token = result.get("refresh_token")
+        self.auto_expires_at = time.time() + result["expires_in"]
+
+    def load(self, data):
+        """Load tokens from their saved form"""
+        self.token = data.get("access_token")
+        self.refresh_token = data.get("refresh_token")
+        self.expires_at = data.get("expiry_date")
+        self.auto_token = data.get("auto_token")
+        self.auto_refresh_token = data.get("auto_refresh")
+        self.auto_expires_at = data.get("auto_expiry")
+        self.loaded = True
+
+    def as_dict(self):
+        """Return tokens in their saved form"""
+        return {
+            "access_token": self.token,
+            "refresh_token": self.refresh_token,
+            "expiry_date": self.expires_at,
+            "auto_token": self.auto_token,
+            "auto_refresh": self.auto_refresh_token,
+            "auto_expiry": self.auto_expires_at,
+        }
+
+    async def async_ensure(self, refresh):
+        """Make sure tokens are valid, sharing one in-flight refresh between all callers"""
+        if self.is_valid():
+            return
+        if self._refresh_task is None:
+            _LOGGER.debug("Tokens expired or missing, starting refresh")
+            self._refresh_task = asyncio.ensure_future(self._async_refresh(refresh))
+        else:
+            _LOGGER.debug("Waiting on refresh already in progress")
+        # Shield so a cancelled caller doesn't cancel the refresh for everyone else
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh(self, refresh):
+        try:
+            await refresh()
+        finally:
+            self._refresh_task = None
+
+
+class TokenStore:
+    """Saves tokens to disk in the background, coalescing bursts of changes into one atomic write"""
+
+    def __init__(self, path, delay=SAVE_DELAY, executor=None):
+        self.path = path
+        self.delay = delay
+        self.executor = executor or get_executor()
+        self.mtime = None
+        self._pending = None
+        self._handle = None
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    def read_mtime(self):
+        """Return the modification time of the token file, or None if there isn't one"""
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def load(self):
+        """Read saved tokens, returning None if there are none or the file can't be parsed"""
+        self.mtime = self.read_mtime()
+        if self.mtime is None:
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as token_file:
+                return json.load(token_file)
+        except ValueError:
+            _LOGGER.warning("Ignoring unreadable token file %s", self.path)
+            return None
+
+    def schedule(self, data):
+        """Queue tokens to be written once no further changes arrive within the delay"""
+        self._pending = dict(data)
+        if self._handle is not None:
+            self._handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._handle = loop.call_later(self.delay, self._start_flush)
+
+    def _start_flush(self):
+        self._handle = None
+        # Keep a reference so the write isn't garbage collected while it runs
+        self._task = asyncio.get_running_loop().create_task(self.async_flush())
+        self._task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task):
+        if self._task is task:
+            self._task = None
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.warning("Failed to save tokens to %s: %s", self.path, task.exception())
+
+    def discard(self):
+        """Drop any write that hasn't happened yet"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending = None
+
+    async def async_flush(self):
+        """Write pending tokens now"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        async with self._lock:
+            data, self._pending = self._pending, None
+            if data is not None:
+                await self.executor.run(self.path, "io", self._write, data)
+
+    def _write(self, data):
+        # Write to a temp file and rename it over the old one so a crash never leaves a partial file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as outfile:
+            json.dump(data, outfile)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        os.replace(tmp_path, self.path)
+        self.mtime = self.read_mtime()
+
+    def remove(self):
+        """Delete the token file"""
+        for path in (self.path, f"{self.path}.tmp"):
+            if os.path.isfile(path):
+                os.remove(path)
+        self.mtime = None
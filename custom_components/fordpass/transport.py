@@ -0,0 +1,217 @@
+"""Pooled HTTP transport shared by every FordPass API call of an account"""
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .ratelimit import RateLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 30
+CONNECT_RETRIES = 3
+CONNECT_BACKOFF = 0.5
+
+# Keep idle connections open between polls so each request doesn't pay for a new TCP and TLS handshake
+KEEPALIVE_TIMEOUT = 120
+DNS_CACHE_TTL = 300
+
+# Concurrent connections per host, hosts not listed use the default
+POOL_SIZE_DEFAULT = 4
+POOL_SIZES = {
+    "api.autonomic.ai": 6,
+    "accounts.autonomic.ai": 2,
+    "api.mps.ford.com": 4,
+    "usapi.cv.ford.com": 2,
+}
+
+# Consecutive failures that pause a host, and how long the pause lasts, doubling with jitter while trials keep failing
+BREAKER_THRESHOLD = 5
+BREAKER_OPEN = 30
+BREAKER_OPEN_MAX = 1800
+
+# Busy answers are retried in place once when Retry-After is this short, otherwise the host is paused until then
+RETRY_STATUSES = (429, 503)
+RETRY_AFTER_WAIT = 5
+
+
+class CircuitOpen(Exception):
+    """Requests to a host are paused after repeated failures or a Retry-After"""
+
+
+def retry_after(response):
+    """Return the seconds a response asks to wait, or None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Tracks failures of one host, once open only a single trial request goes through after the pause"""
+
+    def __init__(self, host):
+        self.host = host
+        self.failures = 0
+        self.opened = 0
+        self.open_until = 0
+        self._trial = False
+
+    def check(self, now):
+        """Raise CircuitOpen if a request to the host may not be sent now"""
+        if now < self.open_until:
+            raise CircuitOpen(f"{self.host} is paused for {self.open_until - now:.0f} seconds")
+        if self.opened:
+            if self._trial:
+                raise CircuitOpen(f"Waiting for the trial request to {self.host}")
+            self._trial = True
+
+    def success(self):
+        """Close the circuit after a good response"""
+        if self.opened:
+            _LOGGER.info("FordPass host %s is responding again", self.host)
+        self.failures = 0
+        self.opened = 0
+        self._trial = False
+
+    def failure(self, now, delay=None):
+        """Count a failure, opening the circuit for delay seconds or the backoff once the threshold is reached"""
+        self.failures += 1
+        self._trial = False
+        if delay is None and not self.opened and self.failures < BREAKER_THRESHOLD:
+            return
+        if delay is None:
+            delay = min(BREAKER_OPEN_MAX, BREAKER_OPEN * 2 ** self.opened) * random.uniform(0.5, 1)
+        delay = min(delay, BREAKER_OPEN_MAX)
+        self.opened += 1
+        self.open_until = now + delay
+        _LOGGER.warning("Pausing requests to %s for %.0f seconds after %s failures", self.host, delay, self.failures)
+
+    def abandon(self):
+        """Forget a request that ended without telling anything about the host"""
+        self._trial = False
+
+
+class Transport:
+    """One keep-alive connection pool for all hosts, with a configurable number of connections per host"""
+
+    def __init__(self, session=None, pool_sizes=None, pool_size_default=POOL_SIZE_DEFAULT, limiter=None):
+        self._session = session
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self._own_session = session is None
+        self.pool_sizes = {**POOL_SIZES, **(pool_sizes or {})}
+        self.pool_size_default = pool_size_default
+        self._slots = {}
+        self._breakers = {}
+        self._closed = False
+
+    @property
+    def session(self):
+        """Return the HTTP session, creating one on first use, raises RuntimeError once the transport is closed"""
+        if self._closed:
+            raise RuntimeError("FordPass transport is closed")
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                # Per host limits are enforced by the transport so each host can have its own size
+                limit=sum(self.pool_sizes.values()) + self.pool_size_default,
+                limit_per_host=0,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
+            self._own_session = True
+        return self._session
+
+    def _host_slots(self, url):
+        host = urlparse(url).hostname
+        slots = self._slots.get(host)
+        if slots is None:
+            slots = asyncio.Semaphore(self.pool_sizes.get(host, self.pool_size_default))
+            self._slots[host] = slots
+        return slots
+
+    def breaker(self, host):
+        """Return the circuit breaker of a host"""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    def isolated(self):
+        """Return a session with its own cookie jar on the shared connection pool, close it when done"""
+        return aiohttp.ClientSession(
+            connector=self.session.connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+
+    async def request(self, method, url, session=None, **kwargs):
+        """
+        Send a request and read the body so it can be used after the connection is released
+        session overrides the shared session, e.g. one from isolated()
+        Raises RateLimited when the limiter sheds the request and CircuitOpen while the host is paused
+        """
+        breaker = self.breaker(urlparse(url).hostname)
+        breaker.check(time.monotonic())
+        try:
+            await self.limiter.acquire(url)
+            response = await self._send(session or self.session, method, url, **kwargs)
+            if response.status in RETRY_STATUSES:
+                delay = retry_after(response)
+                if delay is not None and delay <= RETRY_AFTER_WAIT:
+                    _LOGGER.debug("%s answered %s, retrying in %.1f seconds", breaker.host, response.status, delay)
+                    await asyncio.sleep(delay)
+                    await self.limiter.acquire(url)
+                    response = await self._send(session or self.session, method, url, **kwargs)
+                    delay = retry_after(response)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            breaker.failure(time.monotonic())
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+        if response.status in RETRY_STATUSES:
+            breaker.failure(time.monotonic(), delay)
+        elif response.status >= 500:
+            breaker.failure(time.monotonic())
+        else:
+            breaker.success()
+        return response
+
+    async def _send(self, session, method, url, **kwargs):
+        attempt = 0
+        async with self._host_slots(url):
+            while True:
+                try:
+                    async with session.request(method, url, **kwargs) as response:
+                        await response.read()
+                        return response
+                except aiohttp.ClientConnectorError:
+                    attempt += 1
+                    if attempt > CONNECT_RETRIES:
+                        raise
+                    _LOGGER.debug("Connection to %s failed, retry %s", urlparse(url).hostname, attempt)
+                    # Full jitter so clients that lost the connection together don't retry together
+                    await asyncio.sleep(random.uniform(0, CONNECT_BACKOFF * (2 ** (attempt - 1))))
+
+    async def close(self):
+        """Close the session if the transport created it, the transport can't be used afterwards"""
+        self._closed = True
+        if self._own_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
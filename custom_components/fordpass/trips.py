@@ -0,0 +1,63 @@
+"""Decoded key-off trip segments from the FordPass customEvents payload"""
+import json
+import logging
+from collections import OrderedDict
+
+from homeassistant.util import dt
+
+_LOGGER = logging.getLogger(__name__)
+
+TRIP_EVENT = "xev-key-off-trip-segment-data"
+
+# Distinct trip events kept decoded, the payload only ever carries the latest one
+TRIP_CACHE_SIZE = 4
+
+
+class TripRecord:
+    """One trip segment with its raw metric values, missing values are None"""
+
+    __slots__ = (
+        "ambient_temperature",
+        "outside_air_ambient_temperature",
+        "cabin_temperature",
+        "duration",
+        "energy_consumed",
+        "distance_traveled",
+    )
+
+    def __init__(self, segment):
+        self.ambient_temperature = segment.get("ambient_temperature")
+        self.outside_air_ambient_temperature = segment.get("outside_air_ambient_temperature")
+        self.cabin_temperature = segment.get("cabin_temperature")
+        duration = segment.get("trip_duration")
+        self.duration = str(dt.parse_duration(str(duration))) if duration is not None else None
+        energy = segment.get("energy_consumed")
+        # Reported in Wh, shown in kWh
+        self.energy_consumed = round(energy / 1000, 2) if energy is not None else None
+        self.distance_traveled = segment.get("distance_traveled")
+
+
+class TripCache:
+    """Decodes each trip event once, keyed by its update time or the hash of its content"""
+
+    def __init__(self, size=TRIP_CACHE_SIZE):
+        self.size = size
+        self._records = OrderedDict()
+
+    def records(self, events):
+        """Return the trip records of the current trip event, decoding it only the first time it is seen"""
+        event = (events or {}).get("customEvents", {}).get(TRIP_EVENT, {})
+        segments = event.get("oemData", {}).get("trip_data", {}).get("stringArrayValue", [])
+        if not segments:
+            return ()
+        key = event.get("updateTime") or hash(tuple(segments))
+        records = self._records.get(key)
+        if records is None:
+            records = tuple(TripRecord(json.loads(segment)) for segment in segments)
+            _LOGGER.debug("Decoded %d trip segments for %s", len(records), key)
+            self._records[key] = records
+            if len(self._records) > self.size:
+                self._records.popitem(last=False)
+        else:
+            self._records.move_to_end(key)
+        return records
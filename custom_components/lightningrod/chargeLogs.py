@@ -1,5 +1,4 @@
 import json
-import asyncio
 import os
 import sys
 import logging
@@ -28,7 +27,7 @@ else:
 
 _LOGGER = logging.getLogger(__name__)
 
-async def main():
+def main():
     _LOGGER.debug("Starting charge log retrieval")
     
     # Setup paths
@@ -51,7 +50,7 @@ async def main():
     try:
         # Get charge logs
         _LOGGER.debug("Requesting charge logs from vehicle")
-        logs = await vehicle.ev_energy_transfer_logs()
+        logs = vehicle.ev_energy_transfer_logs()
         
         if not logs:
             _LOGGER.warning("No charge logs retrieved")
@@ -65,7 +64,9 @@ async def main():
 
     except Exception as e:
         _LOGGER.error(f"Error getting charge logs: {e}", exc_info=True)
+    finally:
+        vehicle.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
 